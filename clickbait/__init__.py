@@ -0,0 +1,30 @@
+"""Tools for the YouTube idea cards in ``outputs/Lista de ideias``."""
+
+from .card import (
+    PILLARS,
+    STRATEGIES,
+    Card,
+    CardParseError,
+    Title,
+    format_card,
+    iter_cards,
+    parse_file,
+    parse_lines,
+    parse_text,
+)
+from .index import CardIndex, ScanReport
+
+__all__ = [
+    "PILLARS",
+    "STRATEGIES",
+    "Card",
+    "CardIndex",
+    "CardParseError",
+    "ScanReport",
+    "Title",
+    "format_card",
+    "iter_cards",
+    "parse_file",
+    "parse_lines",
+    "parse_text",
+]
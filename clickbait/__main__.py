@@ -0,0 +1,360 @@
+"""Command line entry point: ``python -m clickbait <command> ...``."""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import os
+import sys
+
+from .card import PILLARS, STRATEGIES
+from .index import CardIndex
+
+DEFAULT_CARDS = "outputs/Lista de ideias"
+DEFAULT_INDEX = ".clickbait-index.db"
+
+
+def _cmd_index(args: argparse.Namespace) -> int:
+    with CardIndex(args.db) as index:
+        report = index.scan(args.cards)
+    print(report)
+    for path, error in report.errors:
+        print(f"  {path}: {error}", file=sys.stderr)
+    return 1 if report.errors else 0
+
+
+def _cmd_query(args: argparse.Namespace) -> int:
+    with CardIndex(args.db) as index:
+        if args.scan:
+            index.scan(args.cards)
+        cards = index.query(
+            strategy=args.strategy,
+            min_score=args.min_score,
+            max_score=args.max_score,
+            mention=args.mention,
+            limit=args.limit,
+        )
+    for card in cards:
+        print(f"{card.score:4.1f}  {card.strategy:<6}  {card.slug}  {card.headline}")
+    return 0
+
+
+def _read_lines(path: str) -> list[str]:
+    if path == "-":
+        return [line.strip() for line in sys.stdin if line.strip()]
+    with open(path, encoding="utf-8") as fh:
+        return [line.strip() for line in fh if line.strip()]
+
+
+def _cmd_score(args: argparse.Namespace) -> int:
+    from .scoring import score_titles
+
+    batch = score_titles(_read_lines(args.titles))
+    for title, score in batch.top(args.top, args.pillar):
+        print(f"{score:4.1f}  {title}")
+    if args.per_pillar:
+        print()
+        for name, (title, score) in zip(PILLARS, batch.pick_per_pillar()):
+            print(f"{score:4.1f}  {name:<18} {title}")
+    return 0
+
+
+def _cmd_lint_titles(args: argparse.Namespace) -> int:
+    from .card import iter_cards
+    from .render import render_card, write_atomic
+    from .titlelen import recount_chars, validate
+
+    problems = 0
+    for card in iter_cards(args.cards):
+        report = validate((t.text for t in card.titles), limit=args.limit, mobile=args.mobile)
+        stale = [
+            (title, length)
+            for title, length in zip(card.titles, report.lengths)
+            if title.chars != length.chars
+        ]
+        for i in report.too_long:
+            print(f"{card.slug}: over {args.limit} chars: {report.titles[i]}")
+        for i in report.truncated:
+            print(f"{card.slug}: cut on mobile ({report.lengths[i].width} cells): {report.titles[i]}")
+        for title, length in stale:
+            print(f"{card.slug}: Chars {title.chars} should be {length.chars}: {title.text}")
+        problems += len(report.too_long) + len(report.truncated) + len(stale)
+        if stale and args.fix:
+            write_atomic(card.path, render_card(recount_chars(card)))
+    return 1 if problems and not args.fix else 0
+
+
+def _cmd_dedup(args: argparse.Namespace) -> int:
+    from .card import iter_cards
+    from .dedup import find_duplicates
+
+    clusters = find_duplicates(iter_cards(args.cards), threshold=args.threshold)
+    for cluster in clusters:
+        print("  ".join(str(key) for key in cluster))
+    return 1 if clusters else 0
+
+
+def _load_backend(spec: str):
+    from .pipeline import FakeBackend
+
+    if spec == "fake":
+        return FakeBackend()
+    module_name, _, attr = spec.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attr or "backend")()
+
+
+def _read_topics(path: str, default_strategy: str) -> list:
+    from .pipeline import Topic
+
+    topics = []
+    for line in _read_lines(path):
+        strategy, sep, headline = line.partition("|")
+        if sep and strategy.strip() in STRATEGIES:
+            topics.append(Topic(headline.strip(), strategy.strip()))
+        else:
+            topics.append(Topic(line, default_strategy))
+    return topics
+
+
+def _seed_dedup(threshold: float, directory: str):
+    """A :class:`~clickbait.dedup.Deduplicator` that already knows the cards in ``directory``."""
+    from .card import iter_cards
+    from .dedup import Deduplicator, common_words
+
+    existing = list(iter_cards(directory)) if os.path.isdir(directory) else []
+    dedup = Deduplicator(threshold, common=common_words(existing))
+    for card in existing:
+        dedup.add(card)
+    return dedup
+
+
+def _cmd_generate(args: argparse.Namespace) -> int:
+    from .pipeline import generate
+    from .render import CardWriter
+
+    topics = _read_topics(args.topics, args.strategy)
+    dedup = _seed_dedup(args.dedup, args.out) if args.dedup is not None else None
+    backend = _load_backend(args.backend)
+    cache = None
+    if args.cache:
+        from .cache import CachingBackend, ResponseCache
+
+        cache = ResponseCache(args.cache, max_entries=args.cache_entries, ttl=args.cache_ttl)
+        backend = CachingBackend(backend, cache)
+    cards, errors = generate(
+        topics,
+        backend,
+        default_limit=args.concurrency,
+        retries=args.retries,
+        admit=dedup.admit if dedup is not None else None,
+    )
+    writer = CardWriter(args.out, on_conflict=args.on_conflict, workers=args.writers, fsync=args.fsync)
+    writer.cleanup()
+    for path in writer.write_batch(cards):
+        print(path)
+    for error in errors:
+        print(error, file=sys.stderr)
+    if cache is not None:
+        print(f"cache: {json.dumps(cache.stats.as_dict())}", file=sys.stderr)
+        cache.close()
+    skipped = len(topics) - len(cards) - len(errors)
+    if skipped:
+        print(f"skipped {skipped} near-duplicate cards", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def _cmd_suggest_tags(args: argparse.Namespace) -> int:
+    from .card import iter_cards
+    from .tags import TagIndex
+
+    cards = list(iter_cards(args.cards))
+    tags = TagIndex.from_cards(cards).suggest(args.topic, args.n)
+    hashtags = TagIndex.from_cards(cards, "hashtags").suggest(args.topic, 3)
+    print(", ".join(tags))
+    print(" ".join(hashtags))
+    return 0
+
+
+def _cmd_export(args: argparse.Namespace) -> int:
+    from .card import iter_cards
+    from .columnar import export_cards
+
+    writer = export_cards(iter_cards(args.cards), args.out, format=args.format, chunk_size=args.chunk_size)
+    print(f"{writer.cards} cards, {writer.titles} titles -> {args.out} ({writer.format})")
+    return 0
+
+
+def _parse_where(conditions: list[str]) -> dict[str, object]:
+    parsed: dict[str, object] = {}
+    for condition in conditions:
+        name, sep, value = condition.partition("=")
+        if not sep:
+            raise SystemExit(f"--where expects column=value, got {condition!r}")
+        values = [int(v) if v.lstrip("-").isdigit() else v for v in value.split(",")]
+        parsed[name.strip()] = values if len(values) > 1 else values[0]
+    return parsed
+
+
+def _cmd_report(args: argparse.Namespace) -> int:
+    from .analytics import group_by, tag_report, where
+    from .columnar import Corpus
+
+    corpus = Corpus(args.export)
+    if args.tags:
+        frame = corpus.read("cards", [args.tags, args.value])
+        rows = tag_report(frame, args.tags, args.value, top=args.top, min_cards=args.min_cards)
+    else:
+        by = [name for name in args.by.split(",") if name] if args.by else []
+        conditions = _parse_where(args.where)
+        needed = {args.value, *conditions, *("date" if name == "month" else name for name in by)}
+        frame = where(corpus.read(args.table, sorted(needed)), conditions)
+        percentiles = [float(q) for q in args.percentiles.split(",")] if args.percentiles else []
+        rows = group_by(frame, by, args.value, percentiles)
+    if args.json:
+        json.dump(rows, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    for row in rows:
+        print("  ".join(
+            f"{key}={value:.2f}" if isinstance(value, float) else f"{key}={value}" for key, value in row.items()
+        ))
+    return 0
+
+
+def _cmd_bench(args: argparse.Namespace) -> int:
+    from .bench import STAGES, compare, run_benchmarks
+
+    report = run_benchmarks(
+        sizes=args.sizes.split(","),
+        stages=args.stages.split(",") if args.stages else STAGES,
+        repeat=args.repeat,
+        memory=args.memory,
+        cprofile_dir=args.cprofile_dir,
+    )
+    for size, stages in report["results"].items():
+        for name, result in stages.items():
+            rate = result["items_per_s"]
+            rate_text = f"{rate:>14,.0f}" if rate is not None else f"{'-':>14}"
+            print(f"{size:>5} {name:<7} {rate_text} items/s  {result['seconds']:.4f}s")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            regressions = compare(json.load(fh), report, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="clickbait", description=__doc__)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("index", help="scan a card folder into the on-disk index")
+    p.add_argument("cards", nargs="?", default=DEFAULT_CARDS)
+    p.add_argument("--db", default=DEFAULT_INDEX)
+    p.set_defaults(func=_cmd_index)
+
+    p = sub.add_parser("query", help="filter indexed cards")
+    p.add_argument("mention", nargs="?", help="terms every match must contain")
+    p.add_argument("--strategy", choices=STRATEGIES)
+    p.add_argument("--min-score", type=float)
+    p.add_argument("--max-score", type=float)
+    p.add_argument("--limit", type=int)
+    p.add_argument("--db", default=DEFAULT_INDEX)
+    p.add_argument("--cards", default=DEFAULT_CARDS)
+    p.add_argument("--scan", action="store_true", help="refresh the index before querying")
+    p.set_defaults(func=_cmd_query)
+
+    p = sub.add_parser("score", help="rank candidate titles, one per line")
+    p.add_argument("titles", nargs="?", default="-", help="file of titles, '-' for stdin")
+    p.add_argument("--top", type=int, default=10)
+    p.add_argument("--pillar", choices=PILLARS, help="rank by one pillar instead of overall")
+    p.add_argument("--per-pillar", action="store_true", help="also print the best title per pillar")
+    p.set_defaults(func=_cmd_score)
+
+    p = sub.add_parser("lint-titles", help="check title lengths and the Chars column")
+    p.add_argument("cards", nargs="?", default=DEFAULT_CARDS)
+    p.add_argument("--limit", type=int, default=100)
+    p.add_argument("--mobile", type=int, default=45, help="mobile truncation point, in cells")
+    p.add_argument("--fix", action="store_true", help="rewrite stale Chars values in place")
+    p.set_defaults(func=_cmd_lint_titles)
+
+    p = sub.add_parser("dedup", help="list clusters of near-duplicate cards")
+    p.add_argument("cards", nargs="?", default=DEFAULT_CARDS)
+    p.add_argument("--threshold", type=float, default=0.9, help="estimated similarity, 0-1")
+    p.set_defaults(func=_cmd_dedup)
+
+    p = sub.add_parser("generate", help="generate cards for topics, one per line")
+    p.add_argument("topics", nargs="?", default="-", help="'Browse | headline' lines, '-' for stdin")
+    p.add_argument("--out", default=DEFAULT_CARDS)
+    p.add_argument("--strategy", choices=STRATEGIES, default="Browse", help="for lines without one")
+    p.add_argument("--backend", default="fake", help="'fake' or 'module:factory'")
+    p.add_argument("--concurrency", type=int, default=8, help="concurrent calls per stage")
+    p.add_argument("--retries", type=int, default=3)
+    p.add_argument("--dedup", type=float, metavar="THRESHOLD", help="drop near-duplicate cards")
+    p.add_argument("--cache", metavar="PATH", help="reuse responses cached in this SQLite file")
+    p.add_argument("--cache-entries", type=int, default=100_000, help="LRU bound on cached responses")
+    p.add_argument("--cache-ttl", type=float, metavar="SECONDS", help="expire cached responses")
+    p.add_argument(
+        "--on-conflict",
+        choices=("suffix", "replace", "skip"),
+        default="suffix",
+        help="when a card's file name is taken: add -2, -3..., overwrite, or keep the old file",
+    )
+    p.add_argument("--writers", type=int, default=1, help="threads rendering and writing cards")
+    p.add_argument("--fsync", action="store_true", help="fsync each card before renaming it into place")
+    p.set_defaults(func=_cmd_generate)
+
+    p = sub.add_parser("suggest-tags", help="suggest tags and hashtags for a topic")
+    p.add_argument("topic")
+    p.add_argument("-n", type=int, default=12)
+    p.add_argument("--cards", default=DEFAULT_CARDS)
+    p.set_defaults(func=_cmd_suggest_tags)
+
+    p = sub.add_parser("export", help="write the cards to a columnar (Parquet or NumPy) export")
+    p.add_argument("out", help="export directory")
+    p.add_argument("--cards", default=DEFAULT_CARDS)
+    p.add_argument("--format", choices=("auto", "parquet", "numpy"), default="auto")
+    p.add_argument("--chunk-size", type=int, default=65_536, help="cards buffered per write")
+    p.set_defaults(func=_cmd_export)
+
+    p = sub.add_parser("report", help="group-by and percentile reports over a columnar export")
+    p.add_argument("export", help="export directory")
+    p.add_argument("--table", choices=("titles", "cards"), default="titles")
+    p.add_argument("--by", default="strategy", help="comma-separated columns, or 'month'; '' for totals")
+    p.add_argument("--value", default="score", help="column to summarise")
+    p.add_argument("--percentiles", default="10,50,90")
+    p.add_argument("--where", action="append", default=[], metavar="COLUMN=VALUE[,VALUE...]")
+    p.add_argument("--tags", choices=("tags", "hashtags"), help="rank tags instead of grouping")
+    p.add_argument("--top", type=int, default=20, help="with --tags: how many")
+    p.add_argument("--min-cards", type=int, default=1, help="with --tags: ignore rarer tags")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=_cmd_report)
+
+    p = sub.add_parser("bench", help="measure throughput on synthetic corpora")
+    p.add_argument("--sizes", default="10,1k", help="comma-separated: 10, 1k, 100k")
+    p.add_argument("--stages", help="comma-separated subset of render,write,parse,index,score,dedup,export")
+    p.add_argument("--repeat", type=int, default=3, help="keep the best of this many runs")
+    p.add_argument("--out", metavar="JSON", help="write the full report here")
+    p.add_argument("--compare", metavar="JSON", help="fail if slower than this earlier report")
+    p.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown, 0-1")
+    p.add_argument("--memory", action="store_true", help="record tracemalloc peaks per stage")
+    p.add_argument("--cprofile-dir", metavar="DIR", help="dump cProfile stats per stage")
+    p.set_defaults(func=_cmd_bench)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""Throughput benchmarks for the card path: render, write, parse, index, score, dedup, export.
+
+Each run uses the fixed synthetic corpora from :mod:`clickbait.synthetic`
+(``10``, ``1k`` and ``100k`` cards) and produces a JSON report with
+items per second for every stage, so two runs can be diffed with
+:func:`compare` instead of eyeballed::
+
+    python -m clickbait bench --sizes 10,1k --out bench.json
+    python -m clickbait bench --sizes 10,1k --compare bench.json
+"""
+
+from __future__ import annotations
+
+import datetime
+import math
+import os
+import platform
+import sys
+import tempfile
+from collections.abc import Callable, Iterable, Sequence
+
+from . import profiling
+from .card import Card, parse_text
+from .index import CardIndex
+from .render import CardTemplate, CardWriter
+from .synthetic import synthetic_cards
+
+__all__ = ["SIZES", "STAGES", "compare", "run_benchmarks"]
+
+SIZES = {"10": 10, "1k": 1_000, "100k": 100_000}
+STAGES = ("render", "write", "parse", "index", "score", "dedup", "export")
+
+
+def _render(cards: list[Card], state: dict) -> int:
+    state["texts"] = CardTemplate().render_many(cards)
+    return len(cards)
+
+
+def _write(cards: list[Card], state: dict) -> int:
+    # Renders again inside the writer: this is the cost of a real export.
+    writer = CardWriter(os.path.join(state["dir"], "synthetic"), on_conflict="replace")
+    writer.write_batch(cards)
+    return len(cards)
+
+
+def _parse(cards: list[Card], state: dict) -> int:
+    for text in state["texts"]:
+        parse_text(text)
+    return len(cards)
+
+
+def _index(cards: list[Card], state: dict) -> int:
+    with CardIndex() as index:
+        index.scan(state["dir"])
+    return len(cards)
+
+
+def _score(cards: list[Card], state: dict) -> int:
+    from .scoring import score_titles
+
+    titles = [title.text for card in cards for title in card.titles]
+    score_titles(titles)
+    return len(titles)
+
+
+def _dedup(cards: list[Card], state: dict) -> int:
+    from .dedup import find_duplicates
+
+    find_duplicates(cards)
+    return len(cards)
+
+
+def _export(cards: list[Card], state: dict) -> int:
+    from .columnar import export_cards
+
+    export_cards(cards, os.path.join(state["dir"], "columnar"))
+    return len(cards)
+
+
+_RUNNERS: dict[str, Callable[[list[Card], dict], int]] = {
+    "render": _render,
+    "write": _write,
+    "parse": _parse,
+    "index": _index,
+    "score": _score,
+    "dedup": _dedup,
+    "export": _export,
+}
+
+
+def _meta() -> dict[str, object]:
+    meta: dict[str, object] = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+    try:
+        import numpy
+
+        meta["numpy"] = numpy.__version__
+    except ImportError:
+        meta["numpy"] = None
+    return meta
+
+
+def run_benchmarks(
+    sizes: Iterable[str] = ("10", "1k"),
+    stages: Sequence[str] = STAGES,
+    repeat: int = 3,
+    seed: int = 0,
+    memory: bool = False,
+    cprofile_dir: str | None = None,
+    workdir: str | None = None,
+) -> dict[str, object]:
+    """Run the selected stages on each corpus size and return the report.
+
+    Each stage keeps its best time over ``repeat`` runs.  ``parse``
+    depends on ``render``, and ``index`` on ``write``; those
+    prerequisites run untimed when not selected.
+    """
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"unknown stages: {sorted(unknown)}")
+    profiler = profiling.Profiler(memory=memory, cprofile_dir=cprofile_dir)
+    results: dict[str, dict[str, dict[str, float]]] = {}
+
+    with profiling.enabled(profiler):
+        for size in sizes:
+            n = SIZES[size]
+            cards = list(synthetic_cards(n, seed))
+            with tempfile.TemporaryDirectory(prefix="clickbait-bench-", dir=workdir) as tmp:
+                state: dict = {"dir": tmp}
+                needed = set(stages)
+                if "parse" in needed:
+                    needed.add("render")
+                if "index" in needed:
+                    needed.add("write")
+                timings: dict[str, dict[str, float]] = {}
+                for name in STAGES:
+                    if name not in needed:
+                        continue
+                    runs = repeat if name in stages else 1
+                    best = None
+                    for _ in range(runs):
+                        with profiler.stage(f"{size}/{name}", n) as clock:
+                            items = _RUNNERS[name](cards, state)
+                        best = clock.elapsed if best is None else min(best, clock.elapsed)
+                    if name in stages:
+                        timings[name] = {
+                            "items": items,
+                            "seconds": best,
+                            # JSON has no infinity; a run too fast to time reports null.
+                            "items_per_s": items / best if best else None,
+                        }
+                results[size] = timings
+
+    return {"meta": _meta(), "repeat": repeat, "seed": seed, "results": results, "profile": profiler.report()}
+
+
+def compare(baseline: dict, current: dict, tolerance: float = 0.10) -> list[str]:
+    """Describe every stage whose throughput fell more than ``tolerance`` below ``baseline``.
+
+    Stages without a usable rate on either side (missing, zero or null)
+    are skipped.
+    """
+    regressions = []
+    for size, stages in current.get("results", {}).items():
+        for name, result in stages.items():
+            before = baseline.get("results", {}).get(size, {}).get(name)
+            if not before:
+                continue
+            rate, previous = result.get("items_per_s"), before.get("items_per_s")
+            if not rate or not previous or not math.isfinite(rate) or not math.isfinite(previous):
+                continue
+            ratio = rate / previous
+            if ratio < 1.0 - tolerance:
+                regressions.append(
+                    f"{size}/{name}: {rate:,.0f}/s vs {previous:,.0f}/s "
+                    f"({(ratio - 1) * 100:+.1f}%)"
+                )
+    return regressions
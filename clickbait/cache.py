@@ -0,0 +1,265 @@
+"""Content-addressed cache for model responses.
+
+Regenerating a batch re-sends many prompts we already paid for: if only
+the scoring prompt changed, the titles, tags, hashtags and hook prompts
+are byte-for-byte the same.  :class:`ResponseCache` stores each response
+in SQLite under a hash of (model, prompt, parameters), evicts the least
+recently used entries past a size bound, expires entries after a TTL,
+and counts the tokens and seconds every hit saved.  Wrap any pipeline
+backend in :class:`CachingBackend` to use it::
+
+    cache = ResponseCache(".clickbait-cache.db", max_entries=100_000)
+    cards, errors = generate(topics, CachingBackend(backend, cache))
+    print(cache.stats)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Callable, Mapping
+
+from . import profiling
+from .pipeline import Backend, Completion
+
+__all__ = ["CacheStats", "CachingBackend", "ResponseCache", "cache_key"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    text TEXT NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    elapsed REAL NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+def cache_key(model: str, prompt: str, params: Mapping[str, object] | None = None) -> str:
+    """Stable hash identifying one model call."""
+    payload = json.dumps(
+        {"model": model, "prompt": prompt, "params": dict(params or {})},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CacheStats:
+    """Hit/miss counters and what the hits saved, overall and per stage."""
+
+    __slots__ = ("hits", "misses", "tokens_saved", "seconds_saved", "evictions", "expired", "by_stage")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+        self.seconds_saved = 0.0
+        self.evictions = 0
+        self.expired = 0
+        self.by_stage: dict[str, list[int]] = {}
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def record(self, stage: str, hit: bool, tokens: int = 0, seconds: float = 0.0) -> None:
+        counts = self.by_stage.setdefault(stage, [0, 0])
+        if hit:
+            self.hits += 1
+            self.tokens_saved += tokens
+            self.seconds_saved += seconds
+            counts[0] += 1
+        else:
+            self.misses += 1
+            counts[1] += 1
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "tokens_saved": self.tokens_saved,
+            "seconds_saved": round(self.seconds_saved, 3),
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "by_stage": {stage: {"hits": h, "misses": m} for stage, (h, m) in self.by_stage.items()},
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"CacheStats(hits={self.hits}, misses={self.misses}, tokens_saved={self.tokens_saved}, "
+            f"seconds_saved={self.seconds_saved:.2f})"
+        )
+
+
+class ResponseCache:
+    """SQLite-backed LRU cache of :class:`~clickbait.pipeline.Completion` objects.
+
+    ``max_entries`` and ``max_bytes`` (of response text) bound the cache;
+    the least recently read entries go first.  Entries older than ``ttl``
+    seconds are treated as misses and dropped.  ``clock`` is injectable
+    for tests.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] = ":memory:",
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._db = sqlite3.connect(os.fspath(path), isolation_level=None)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.executescript(_SCHEMA)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self.stats = CacheStats()
+        # Running totals so bounding the cache never needs a table scan.
+        self._recount()
+
+    def __enter__(self) -> ResponseCache:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __len__(self) -> int:
+        return self._entries
+
+    def get(self, key: str, stage: str = "") -> Completion | None:
+        """Return the cached completion for ``key``, or ``None`` on a miss."""
+        row = self._db.execute(
+            "SELECT text, prompt_tokens, completion_tokens, elapsed, created FROM responses WHERE key = ?",
+            (key,),
+        ).fetchone()
+        now = self.clock()
+        if row is not None and self.ttl is not None and now - row[4] > self.ttl:
+            self._delete(key)
+            self.stats.expired += 1
+            row = None
+        if row is None:
+            self.stats.record(stage, hit=False)
+            return None
+        text, prompt_tokens, completion_tokens, elapsed, _ = row
+        self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        self.stats.record(stage, hit=True, tokens=prompt_tokens + completion_tokens, seconds=elapsed)
+        return Completion(text, prompt_tokens, completion_tokens)
+
+    def put(
+        self, key: str, completion: Completion, model: str = "", stage: str = "", elapsed: float = 0.0
+    ) -> None:
+        """Store ``completion`` under ``key``; ``elapsed`` is what the call took."""
+        now = self.clock()
+        size = len(completion.text.encode("utf-8"))
+        old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses (key, model, stage, text, prompt_tokens, completion_tokens,"
+            " elapsed, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                model,
+                stage,
+                completion.text,
+                completion.prompt_tokens,
+                completion.completion_tokens,
+                elapsed,
+                size,
+                now,
+                now,
+            ),
+        )
+        if old is None:
+            self._entries += 1
+            self._bytes += size
+        else:
+            self._bytes += size - old[0]
+        self._evict()
+
+    def _evict(self) -> None:
+        over_entries = self.max_entries is not None and self._entries > self.max_entries
+        over_bytes = self.max_bytes is not None and self._bytes > self.max_bytes
+        if not (over_entries or over_bytes):
+            return
+        victims = []
+        entries, total = self._entries, self._bytes
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if (self.max_entries is None or entries <= self.max_entries) and (
+                self.max_bytes is None or total <= self.max_bytes
+            ):
+                break
+            victims.append((key,))
+            entries -= 1
+            total -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self._entries, self._bytes = entries, total
+        self.stats.evictions += len(victims)
+
+    def _delete(self, key: str) -> None:
+        row = self._db.execute("DELETE FROM responses WHERE key = ? RETURNING size", (key,)).fetchone()
+        if row is not None:
+            self._entries -= 1
+            self._bytes -= row[0]
+
+    def _recount(self) -> None:
+        self._entries, self._bytes = self._db.execute(
+            "SELECT count(*), coalesce(sum(size), 0) FROM responses"
+        ).fetchone()
+
+    def purge_expired(self) -> int:
+        """Delete every entry past its TTL; return how many were removed."""
+        if self.ttl is None:
+            return 0
+        cur = self._db.execute("DELETE FROM responses WHERE created < ?", (self.clock() - self.ttl,))
+        removed = cur.rowcount
+        self.stats.expired += removed
+        self._recount()
+        return removed
+
+    def clear(self) -> None:
+        self._db.execute("DELETE FROM responses")
+        self._entries = self._bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the cached response text."""
+        return self._bytes
+
+
+class CachingBackend:
+    """Pipeline backend that answers from a :class:`ResponseCache` when it can."""
+
+    def __init__(self, backend: Backend, cache: ResponseCache) -> None:
+        self.backend = backend
+        self.cache = cache
+        self.model = backend.model
+
+    async def complete(self, prompt: str, *, stage: str, **params: object) -> Completion:
+        key = cache_key(self.model, prompt, params)
+        cached = self.cache.get(key, stage)
+        if cached is not None:
+            profiling.active().count("cache.hit")
+            return cached
+        profiling.active().count("cache.miss")
+        started = time.perf_counter()
+        completion = await self.backend.complete(prompt, stage=stage, **params)
+        self.cache.put(key, completion, self.model, stage, time.perf_counter() - started)
+        return completion
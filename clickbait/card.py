@@ -0,0 +1,261 @@
+"""Idea card records and the streaming markdown parser.
+
+Every card in ``outputs/Lista de ideias`` follows the same layout::
+
+    # 🎬 <headline>
+
+    **Score**: 8.6/10 | **Data**: 2026-02-06 | **Estratégia**: Browse
+
+    ## 🎯 TÍTULOS (5 Pilares Emocionais)
+    | # | Pilar | Título | Chars |
+    ...
+    ## 🏷️ TAGS
+    ## #️⃣ HASHTAGS
+    ## 🎬 HOOK (primeiros 30s)
+
+:func:`parse_lines` walks the lines exactly once and never holds more than
+the current section in memory, so it can be fed straight from an open
+file.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from collections.abc import Iterable, Iterator
+
+from .text import fold
+
+__all__ = [
+    "PILLARS",
+    "STRATEGIES",
+    "Card",
+    "CardParseError",
+    "Title",
+    "format_card",
+    "iter_card_paths",
+    "iter_cards",
+    "parse_file",
+    "parse_lines",
+    "parse_text",
+]
+
+#: The five emotional pillars, in the order the titles table lists them.
+PILLARS = (
+    "Curiosidade",
+    "Medo/Urgência",
+    "Desejo/Recompensa",
+    "Surpresa/Novidade",
+    "FOMO",
+)
+
+STRATEGIES = ("Browse", "Search")
+
+_META = re.compile(
+    r"\*\*Score\*\*:\s*(?P<score>[0-9]+(?:[.,][0-9]+)?)\s*/\s*10"
+    r"\s*\|\s*\*\*Data\*\*:\s*(?P<date>[0-9]{4}-[0-9]{2}-[0-9]{2})"
+    r"\s*\|\s*\*\*Estrat[ée]gia\*\*:\s*(?P<strategy>\w+)"
+)
+_ROW = re.compile(r"^\|\s*(?P<num>\d+)\s*\|(?P<pillar>[^|]*)\|(?P<title>.*)\|\s*(?P<chars>\d+)\s*\|\s*$")
+
+# Section keys, matched against the folded ``## ...`` heading.
+_SECTIONS = (
+    ("hashtags", "hashtags"),
+    ("titulos", "titles"),
+    ("tags", "tags"),
+    ("hook", "hook"),
+)
+
+
+class CardParseError(ValueError):
+    """Raised when a markdown file does not follow the idea card layout."""
+
+
+class Title:
+    """One row of the titles table."""
+
+    __slots__ = ("number", "pillar", "text", "chars")
+
+    def __init__(self, number: int, pillar: str, text: str, chars: int) -> None:
+        self.number = number
+        self.pillar = pillar
+        self.text = text
+        self.chars = chars
+
+    def __repr__(self) -> str:
+        return f"Title({self.number!r}, {self.pillar!r}, {self.text!r}, {self.chars!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Title):
+            return NotImplemented
+        return (self.number, self.pillar, self.text, self.chars) == (
+            other.number,
+            other.pillar,
+            other.text,
+            other.chars,
+        )
+
+
+class Card:
+    """A parsed idea card.
+
+    ``path`` is the file the card was read from (``None`` for cards built in
+    memory); every other field mirrors a section of the markdown file.
+    """
+
+    __slots__ = ("path", "headline", "score", "date", "strategy", "titles", "tags", "hashtags", "hook")
+
+    def __init__(
+        self,
+        headline: str,
+        score: float,
+        date: str,
+        strategy: str,
+        titles: tuple[Title, ...] = (),
+        tags: tuple[str, ...] = (),
+        hashtags: tuple[str, ...] = (),
+        hook: str = "",
+        path: str | None = None,
+    ) -> None:
+        self.path = path
+        self.headline = headline
+        self.score = score
+        self.date = date
+        self.strategy = strategy
+        self.titles = titles
+        self.tags = tags
+        self.hashtags = hashtags
+        self.hook = hook
+
+    def __repr__(self) -> str:
+        return f"Card({self.headline!r}, score={self.score!r}, strategy={self.strategy!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Card):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    @property
+    def slug(self) -> str | None:
+        """File name without the ``.md`` suffix, if the card came from disk."""
+        if self.path is None:
+            return None
+        return os.path.splitext(os.path.basename(self.path))[0]
+
+    def search_text(self) -> str:
+        """Folded text of every searchable field, used by the index."""
+        parts = [self.headline, *(t.text for t in self.titles), *self.tags, *self.hashtags, self.hook]
+        return fold(" ".join(parts))
+
+
+def _section_of(heading: str) -> str | None:
+    key = fold(heading)
+    for needle, name in _SECTIONS:
+        if needle in key:
+            return name
+    return None
+
+
+def parse_lines(lines: Iterable[str], path: str | None = None) -> Card:
+    """Parse a card from an iterable of lines in a single pass."""
+    headline = None
+    meta = None
+    titles: list[Title] = []
+    tags: list[str] = []
+    hashtags: list[str] = []
+    hook: list[str] = []
+    section = None
+
+    for raw in lines:
+        line = raw.strip()
+        if not line or line == "---":
+            continue
+        if line.startswith("## "):
+            section = _section_of(line[3:])
+            continue
+        if headline is None and line.startswith("# "):
+            headline = line[2:].lstrip("🎬").strip()
+            continue
+        if meta is None and line.startswith("**Score**"):
+            meta = _META.search(line)
+            if meta is None:
+                raise CardParseError(f"{path or '<card>'}: malformed header line {line!r}")
+            continue
+        if section == "titles":
+            row = _ROW.match(line)
+            if row is not None:
+                titles.append(
+                    Title(
+                        int(row["num"]),
+                        row["pillar"].strip(),
+                        row["title"].strip(),
+                        int(row["chars"]),
+                    )
+                )
+        elif section == "tags":
+            tags.extend(tag.strip() for tag in line.split(",") if tag.strip())
+        elif section == "hashtags":
+            hashtags.extend(word for word in line.split() if word.startswith("#"))
+        elif section == "hook":
+            hook.append(line)
+
+    if headline is None:
+        raise CardParseError(f"{path or '<card>'}: missing '# ' headline")
+    if meta is None:
+        raise CardParseError(f"{path or '<card>'}: missing '**Score**' header line")
+
+    hook_text = " ".join(hook)
+    if len(hook_text) >= 2 and hook_text[0] == hook_text[-1] == '"':
+        hook_text = hook_text[1:-1]
+
+    return Card(
+        headline=headline,
+        score=float(meta["score"].replace(",", ".")),
+        date=meta["date"],
+        strategy=meta["strategy"],
+        titles=tuple(titles),
+        tags=tuple(tags),
+        hashtags=tuple(hashtags),
+        hook=hook_text,
+        path=path,
+    )
+
+
+def parse_text(text: str, path: str | None = None) -> Card:
+    """Parse a card from an in-memory markdown string."""
+    return parse_lines(text.splitlines(), path)
+
+
+def parse_file(path: str | os.PathLike[str]) -> Card:
+    """Parse the card stored at ``path``."""
+    path = os.fspath(path)
+    with open(path, encoding="utf-8") as fh:
+        return parse_lines(fh, path)
+
+
+def iter_card_paths(directory: str | os.PathLike[str]) -> Iterator[os.DirEntry[str]]:
+    """Yield a directory entry for every ``*.md`` file under ``directory``."""
+    stack = [os.fspath(directory)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".md") and entry.is_file():
+                    yield entry
+
+
+def iter_cards(directory: str | os.PathLike[str]) -> Iterator[Card]:
+    """Parse every card under ``directory``, lazily."""
+    for entry in iter_card_paths(directory):
+        yield parse_file(entry.path)
+
+
+def format_card(card: Card) -> str:
+    """Render ``card`` back to the markdown layout :func:`parse_lines` reads.
+
+    The layout itself lives in :data:`clickbait.render.CARD_TEMPLATE`.
+    """
+    from .render import render_card
+
+    return render_card(card)
@@ -0,0 +1,471 @@
+"""Columnar export of the idea corpus.
+
+The ``Score``, ``Data``, ``Estratégia``, pillar, ``Chars``, tag and
+hashtag fields are locked inside markdown; :class:`ColumnarWriter`
+streams cards into two column tables so analyses read a few arrays
+instead of re-parsing every card:
+
+``cards``
+    ``card`` (row id), ``slug``, ``headline``, ``score``, ``date``,
+    ``strategy``, ``tags``, ``hashtags``
+``titles``
+    ``card``, ``number``, ``pillar``, ``text``, ``chars``, ``width``
+    and the card's ``score``, ``date`` and ``strategy``, repeated per
+    title so title reports need no join
+
+``strategy``, ``pillar``, ``tags`` and ``hashtags`` are dictionary
+encoded.  Cards are buffered ``chunk_size`` at a time and each chunk is
+written out before the next one is read, so memory stays bounded however
+large the corpus.  With pyarrow installed the tables are Parquet files;
+without it each chunk is an ``.npz`` file of plain arrays (strings and
+lists as flat values plus offsets) and the dictionaries go in the
+manifest.  :class:`Corpus` reads either layout back into NumPy columns::
+
+    with ColumnarWriter("corpus") as writer:
+        writer.write(iter_cards("outputs/Lista de ideias"))
+    titles = Corpus("corpus").read("titles", ["strategy", "score"])
+
+Requires NumPy; Parquet also needs pyarrow.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+from . import profiling
+from .card import Card
+from .text import slugify
+from .titlelen import measure
+
+__all__ = [
+    "COLUMNS",
+    "DICTIONARY_COLUMNS",
+    "ColumnarWriter",
+    "Corpus",
+    "Frame",
+    "export_cards",
+]
+
+FORMAT = "clickbait-columnar"
+VERSION = 1
+MANIFEST = "manifest.json"
+
+COLUMNS = {
+    "cards": ("card", "slug", "headline", "score", "date", "strategy", "tags", "hashtags"),
+    "titles": ("card", "number", "pillar", "text", "chars", "width", "score", "date", "strategy"),
+}
+#: Columns stored as integer codes into a shared dictionary.
+DICTIONARY_COLUMNS = frozenset({"strategy", "pillar", "tags", "hashtags"})
+_STRING_COLUMNS = frozenset({"slug", "headline", "text"})
+_LIST_COLUMNS = frozenset({"tags", "hashtags"})
+_DTYPES = {
+    "card": np.int32,
+    "number": np.int8,
+    "chars": np.int16,
+    "width": np.int16,
+    "score": np.float64,
+    "date": "datetime64[D]",
+}
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def _dates(values: list[str]) -> np.ndarray:
+    try:
+        return np.array(values, dtype="datetime64[D]")
+    except ValueError:
+        out = np.empty(len(values), dtype="datetime64[D]")
+        for i, value in enumerate(values):
+            try:
+                out[i] = np.datetime64(value, "D")
+            except ValueError:
+                out[i] = np.datetime64("NaT")
+        return out
+
+
+def _offsets(lengths: list[int]) -> np.ndarray:
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+class Frame:
+    """Columns of one table as NumPy arrays.
+
+    Dictionary columns hold ``int32`` codes into :attr:`categories`;
+    list columns (``tags``, ``hashtags``) hold the flat codes of every
+    row with row ``i`` spanning ``offsets[name][i]:offsets[name][i + 1]``.
+    """
+
+    __slots__ = ("columns", "categories", "offsets", "length")
+
+    def __init__(
+        self,
+        columns: dict[str, np.ndarray],
+        categories: dict[str, list[str]],
+        offsets: dict[str, np.ndarray],
+        length: int,
+    ) -> None:
+        self.columns = columns
+        self.categories = categories
+        self.offsets = offsets
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.columns
+
+    def __repr__(self) -> str:
+        return f"Frame({self.length} rows, columns={list(self.columns)})"
+
+    def labels(self, name: str) -> np.ndarray:
+        """Decoded values of a dictionary column, as an object array."""
+        return np.asarray(self.categories[name], dtype=object)[self.columns[name]]
+
+    def code(self, name: str, value: str) -> int:
+        """Code of ``value`` in a dictionary column, or -1 if it never occurs."""
+        try:
+            return self.categories[name].index(value)
+        except ValueError:
+            return -1
+
+    def filter(self, mask: np.ndarray) -> Frame:
+        """The rows where ``mask`` is true."""
+        columns = {}
+        offsets = {}
+        for name, values in self.columns.items():
+            if name in self.offsets:
+                lengths = np.diff(self.offsets[name])
+                columns[name] = values[np.repeat(mask, lengths)]
+                offsets[name] = _offsets(lengths[mask])
+            else:
+                columns[name] = values[mask]
+        return Frame(columns, self.categories, offsets, int(np.count_nonzero(mask)))
+
+
+class _Chunk:
+    """Python-side buffer for one chunk of rows, encoded on flush."""
+
+    def __init__(self, table: str) -> None:
+        self.values: dict[str, list] = {name: [] for name in COLUMNS[table]}
+        self.rows = 0
+
+    def encode(self) -> dict[str, np.ndarray]:
+        """Flatten to named arrays: ``name`` or ``name.data``/``name.offsets``."""
+        arrays = {}
+        for name, values in self.values.items():
+            if name in _LIST_COLUMNS:
+                arrays[f"{name}.data"] = np.fromiter(
+                    (code for row in values for code in row), dtype=np.int32
+                )
+                arrays[f"{name}.offsets"] = _offsets([len(row) for row in values])
+            elif name in _STRING_COLUMNS:
+                encoded = [value.encode("utf-8") for value in values]
+                arrays[f"{name}.data"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+                arrays[f"{name}.offsets"] = _offsets([len(value) for value in encoded])
+            elif name in DICTIONARY_COLUMNS:
+                arrays[name] = np.array(values, dtype=np.int32)
+            elif name == "date":
+                arrays[name] = _dates(values)
+            else:
+                arrays[name] = np.array(values, dtype=_DTYPES[name])
+        return arrays
+
+
+class ColumnarWriter:
+    """Streams cards into a columnar export directory.
+
+    ``format`` is ``"parquet"``, ``"numpy"`` or ``"auto"`` (Parquet when
+    pyarrow is importable).  Rows are flushed every ``chunk_size`` cards.
+    Use as a context manager, or call :meth:`close` to write the
+    manifest; an export without a manifest is incomplete.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        format: str = "auto",
+        chunk_size: int = 65_536,
+    ) -> None:
+        if format not in ("auto", "parquet", "numpy"):
+            raise ValueError(f"format must be 'auto', 'parquet' or 'numpy', not {format!r}")
+        self._pa = _pyarrow() if format != "numpy" else None
+        if format == "parquet" and self._pa is None:
+            raise ImportError("the parquet format needs pyarrow")
+        self.format = "parquet" if self._pa is not None else "numpy"
+        self.path = os.fspath(path)
+        self.chunk_size = max(1, chunk_size)
+        self.cards = 0
+        self.titles = 0
+        os.makedirs(self.path, exist_ok=True)
+        manifest = os.path.join(self.path, MANIFEST)
+        if os.path.exists(manifest):
+            os.remove(manifest)
+        self._dictionaries: dict[str, dict[str, int]] = {
+            "strategy": {},
+            "pillar": {},
+            "tags": {},
+            "hashtags": {},
+        }
+        self._chunks = {"cards": 0, "titles": 0}
+        self._parquet: dict[str, object] = {}
+        self._buffers = {"cards": _Chunk("cards"), "titles": _Chunk("titles")}
+
+    def __enter__(self) -> ColumnarWriter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _code(self, column: str, value: str) -> int:
+        codes = self._dictionaries[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+        return code
+
+    def add(self, card: Card) -> None:
+        row = self.cards
+        strategy = self._code("strategy", card.strategy)
+        cards = self._buffers["cards"].values
+        cards["card"].append(row)
+        # Cards not read from disk get the slug CardWriter would name them by.
+        cards["slug"].append(card.slug or slugify(card.headline))
+        cards["headline"].append(card.headline)
+        cards["score"].append(card.score)
+        cards["date"].append(card.date)
+        cards["strategy"].append(strategy)
+        cards["tags"].append([self._code("tags", tag) for tag in card.tags])
+        cards["hashtags"].append([self._code("hashtags", tag) for tag in card.hashtags])
+        self._buffers["cards"].rows += 1
+
+        titles = self._buffers["titles"].values
+        for title in card.titles:
+            titles["card"].append(row)
+            titles["number"].append(title.number)
+            titles["pillar"].append(self._code("pillar", title.pillar))
+            titles["text"].append(title.text)
+            titles["chars"].append(title.chars)
+            titles["width"].append(measure(title.text).width)
+            titles["score"].append(card.score)
+            titles["date"].append(card.date)
+            titles["strategy"].append(strategy)
+        self._buffers["titles"].rows += len(card.titles)
+        self.titles += len(card.titles)
+        self.cards += 1
+        if self._buffers["cards"].rows >= self.chunk_size:
+            self.flush()
+
+    def write(self, cards: Iterable[Card]) -> int:
+        """Add every card in ``cards``; returns how many were added."""
+        before = self.cards
+        with profiling.stage("export") as timer:
+            for card in cards:
+                self.add(card)
+            timer.items = self.cards - before
+        return self.cards - before
+
+    def flush(self) -> None:
+        for table, buffer in self._buffers.items():
+            if not buffer.rows:
+                continue
+            arrays = buffer.encode()
+            if self.format == "parquet":
+                self._write_parquet(table, arrays, buffer.rows)
+            else:
+                name = f"{table}-{self._chunks[table]:05d}.npz"
+                np.savez(os.path.join(self.path, name), **arrays)
+            self._chunks[table] += 1
+            self._buffers[table] = _Chunk(table)
+
+    def _write_parquet(self, table: str, arrays: dict[str, np.ndarray], rows: int) -> None:
+        pa = self._pa
+        columns = []
+        for name in COLUMNS[table]:
+            if name in _LIST_COLUMNS:
+                dictionary = pa.array(list(self._dictionaries[name]), type=pa.string())
+                values = pa.DictionaryArray.from_arrays(pa.array(arrays[f"{name}.data"]), dictionary)
+                offsets = pa.array(arrays[f"{name}.offsets"].astype(np.int32))
+                columns.append(pa.ListArray.from_arrays(offsets, values))
+            elif name in _STRING_COLUMNS:
+                offsets = pa.array(arrays[f"{name}.offsets"].astype(np.int32))
+                data = pa.py_buffer(arrays[f"{name}.data"])
+                columns.append(pa.Array.from_buffers(pa.string(), rows, [None, offsets.buffers()[1], data]))
+            elif name in DICTIONARY_COLUMNS:
+                dictionary = pa.array(list(self._dictionaries[name]), type=pa.string())
+                columns.append(pa.DictionaryArray.from_arrays(pa.array(arrays[name]), dictionary))
+            elif name == "date":
+                columns.append(pa.array(arrays[name], type=pa.date32()))
+            else:
+                columns.append(pa.array(arrays[name]))
+        batch = pa.Table.from_arrays(columns, names=list(COLUMNS[table]))
+        writer = self._parquet.get(table)
+        if writer is None:
+            writer = self._parquet[table] = pa.parquet.ParquetWriter(
+                os.path.join(self.path, f"{table}.parquet"), batch.schema
+            )
+        writer.write_table(batch)
+
+    def close(self) -> None:
+        """Flush the last chunk and write the manifest."""
+        if self._buffers is None:
+            return
+        self.flush()
+        for writer in self._parquet.values():
+            writer.close()
+        manifest = {
+            "format": FORMAT,
+            "version": VERSION,
+            "storage": self.format,
+            "rows": {"cards": self.cards, "titles": self.titles},
+            "chunks": self._chunks,
+        }
+        if self.format == "numpy":
+            manifest["dictionaries"] = {name: list(codes) for name, codes in self._dictionaries.items()}
+        with open(os.path.join(self.path, MANIFEST), "w", encoding="utf-8") as fh:
+            json.dump(manifest, fh, ensure_ascii=False, indent=1)
+            fh.write("\n")
+        self._buffers = None
+
+
+def export_cards(
+    cards: Iterable[Card],
+    path: str | os.PathLike[str],
+    format: str = "auto",
+    chunk_size: int = 65_536,
+) -> ColumnarWriter:
+    """Write ``cards`` to a columnar export at ``path``; returns the closed writer."""
+    with ColumnarWriter(path, format=format, chunk_size=chunk_size) as writer:
+        writer.write(cards)
+    return writer
+
+
+def _decode_strings(data: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    raw = data.tobytes()
+    out = np.empty(len(offsets) - 1, dtype=object)
+    for i in range(len(out)):
+        out[i] = raw[offsets[i]:offsets[i + 1]].decode("utf-8")
+    return out
+
+
+class Corpus:
+    """Read access to a columnar export written by :class:`ColumnarWriter`."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = os.fspath(path)
+        with open(os.path.join(self.path, MANIFEST), encoding="utf-8") as fh:
+            manifest = json.load(fh)
+        if manifest.get("format") != FORMAT or manifest.get("version") != VERSION:
+            raise ValueError(f"{self.path} is not a {FORMAT} v{VERSION} export")
+        self.storage: str = manifest["storage"]
+        self.rows: dict[str, int] = manifest["rows"]
+        self._chunks: dict[str, int] = manifest["chunks"]
+        self._dictionaries: dict[str, list[str]] = manifest.get("dictionaries", {})
+
+    def __repr__(self) -> str:
+        return f"Corpus({self.path!r}, storage={self.storage!r}, rows={self.rows})"
+
+    def read(self, table: str, columns: Sequence[str] | None = None) -> Frame:
+        """Load ``columns`` (default: all) of ``table`` into a :class:`Frame`."""
+        if table not in COLUMNS:
+            raise ValueError(f"table must be 'cards' or 'titles', not {table!r}")
+        columns = tuple(columns) if columns else COLUMNS[table]
+        unknown = set(columns) - set(COLUMNS[table])
+        if unknown:
+            raise ValueError(f"unknown {table} columns: {sorted(unknown)}")
+        with profiling.stage(f"read.{table}") as timer:
+            if self.storage == "parquet":
+                frame = self._read_parquet(table, columns)
+            else:
+                frame = self._read_numpy(table, columns)
+            timer.items = len(frame)
+        return frame
+
+    def _read_numpy(self, table: str, columns: Sequence[str]) -> Frame:
+        parts: dict[str, list[np.ndarray]] = {}
+        for chunk in range(self._chunks[table]):
+            with np.load(os.path.join(self.path, f"{table}-{chunk:05d}.npz")) as npz:
+                for name in columns:
+                    if name in _LIST_COLUMNS or name in _STRING_COLUMNS:
+                        parts.setdefault(f"{name}.data", []).append(npz[f"{name}.data"])
+                        parts.setdefault(f"{name}.offsets", []).append(npz[f"{name}.offsets"])
+                    else:
+                        parts.setdefault(name, []).append(npz[name])
+        out: dict[str, np.ndarray] = {}
+        offsets: dict[str, np.ndarray] = {}
+        for name in columns:
+            if name in _LIST_COLUMNS or name in _STRING_COLUMNS:
+                data = parts.get(f"{name}.data", [])
+                chunk_offsets = parts.get(f"{name}.offsets", [])
+                flat = np.concatenate(data) if data else np.empty(0, np.uint8 if name in _STRING_COLUMNS else np.int32)
+                lengths = np.concatenate([np.diff(o) for o in chunk_offsets]) if chunk_offsets else np.empty(0, np.int64)
+                row_offsets = _offsets(lengths)
+                if name in _STRING_COLUMNS:
+                    out[name] = _decode_strings(flat, row_offsets)
+                else:
+                    out[name] = flat
+                    offsets[name] = row_offsets
+            else:
+                chunks = parts.get(name, [])
+                out[name] = np.concatenate(chunks) if chunks else np.empty(0, _DTYPES.get(name, np.int32))
+        categories = {name: self._dictionaries[name] for name in columns if name in DICTIONARY_COLUMNS}
+        return Frame(out, categories, offsets, self.rows[table])
+
+    def _read_parquet(self, table: str, columns: Sequence[str]) -> Frame:
+        pa = _pyarrow()
+        if pa is None:
+            raise ImportError("reading a parquet export needs pyarrow")
+        path = os.path.join(self.path, f"{table}.parquet")
+        data = pa.parquet.read_table(path, columns=list(columns)) if os.path.exists(path) else None
+        out: dict[str, np.ndarray] = {}
+        offsets: dict[str, np.ndarray] = {}
+        categories: dict[str, list[str]] = {}
+        for name in columns:
+            chunks = data.column(name).chunks if data is not None else []
+            if name in DICTIONARY_COLUMNS:
+                # Each Parquet row group may come back with its own dictionary;
+                # remap them all onto one.
+                codes: dict[str, int] = {}
+                pieces = []
+                lengths = []
+                for chunk in chunks:
+                    if name in _LIST_COLUMNS:
+                        lengths.append(np.diff(chunk.offsets.to_numpy()))
+                        chunk = chunk.flatten()
+                    if not pa.types.is_dictionary(chunk.type):
+                        chunk = chunk.dictionary_encode()
+                    remap = np.array(
+                        [codes.setdefault(value, len(codes)) for value in chunk.dictionary.to_pylist()],
+                        dtype=np.int32,
+                    )
+                    pieces.append(remap[chunk.indices.to_numpy(zero_copy_only=False)])
+                out[name] = np.concatenate(pieces) if pieces else np.empty(0, np.int32)
+                categories[name] = list(codes)
+                if name in _LIST_COLUMNS:
+                    offsets[name] = _offsets(np.concatenate(lengths) if lengths else np.empty(0, np.int64))
+            elif name in _STRING_COLUMNS:
+                out[name] = np.concatenate(
+                    [chunk.to_numpy(zero_copy_only=False) for chunk in chunks]
+                ) if chunks else np.empty(0, object)
+            else:
+                dtype = _DTYPES[name]
+                out[name] = np.concatenate(
+                    [chunk.to_numpy(zero_copy_only=False).astype(dtype) for chunk in chunks]
+                ) if chunks else np.empty(0, dtype)
+        return Frame(out, categories, offsets, self.rows[table])
@@ -0,0 +1,339 @@
+"""Near-duplicate detection for idea cards with MinHash and LSH.
+
+Each card is reduced to three sets of folded content words: its titles,
+its tags and its hook.  :class:`MinHasher` gives every field an equal
+slice of a fixed-size signature, so the fraction of agreeing values
+estimates the mean Jaccard similarity of the fields, and
+:class:`LSHIndex` buckets signatures by bands so a lookup only compares
+against the few cards that share a bucket instead of the whole corpus.
+
+Cards in one series share most of their vocabulary: the product name,
+the title templates, the hook's "Nesse vídeo eu vou te mostrar".  Words
+used by more than half of the corpus (:func:`common_words`) are left out
+of the features.  On the ten cards in ``outputs/Lista de ideias`` that
+puts every pair between 0.0 and 0.18, while a "(parte 2)" rewrite of any
+of them scores 0.95-0.975; the default threshold of ``0.9`` catches
+rewrites and regenerated cards.
+
+Cards written separately on one topic are *not* caught.  The three
+install/setup cards (``openclaw-instalacao-configuracao``,
+``openclaw-vps-instalacao``, ``openclaw-configurar-sem-erros``) score
+0.18, 0.07 and 0.02 against each other, within the range of unrelated
+pairs, and stemming, whole-tag features or hook shingles do not change
+that: their titles and hooks share themes, not wording.
+
+Requires NumPy.
+"""
+
+from __future__ import annotations
+
+import itertools
+import zlib
+from collections import Counter
+from collections.abc import Container, Hashable, Iterable, Iterator
+
+import numpy as np
+
+from . import profiling
+from .card import Card
+from .text import terms
+
+__all__ = [
+    "STOPWORDS",
+    "Deduplicator",
+    "LSHIndex",
+    "MinHasher",
+    "card_features",
+    "common_words",
+    "find_duplicates",
+    "similarity",
+]
+
+# Universal hashing h(x) = (a*x + b) mod p with x < 2**32 and a < 2**31 stays
+# below 2**64, so it never overflows uint64.
+_PRIME = np.uint64((1 << 32) + 15)
+_MAX_A = 1 << 31
+# Real hash values are below _PRIME, so a slice made only of _PRIME marks
+# an empty feature set.
+_EMPTY = _PRIME
+
+DEFAULT_THRESHOLD = 0.9
+
+#: Common title/tag words that say nothing about the topic.
+STOPWORDS = frozenset(
+    "a as o os e de da das do dos em no na nos nas um uma que pra para por com se seu sua meu "
+    "minha eu voce isso esse essa nesse nessa the".split()
+)
+
+
+def _content_words(texts: Iterable[str]) -> set[str]:
+    return {word for text in texts for word in terms(text) if word not in STOPWORDS}
+
+
+def card_features(card: Card, common: frozenset[str] = frozenset()) -> tuple[set[str], set[str], set[str]]:
+    """The title, tag and hook word sets MinHash signatures are built from.
+
+    Words in ``common`` are left out, like :data:`STOPWORDS`.
+    """
+    return (
+        _content_words(t.text for t in card.titles) - common,
+        _content_words(card.tags) - common,
+        _content_words((card.hook,)) - common,
+    )
+
+
+def common_words(cards: Iterable[Card], max_df: float = 0.5, min_cards: int = 10) -> frozenset[str]:
+    """Words found in more than ``max_df`` of ``cards``: series boilerplate.
+
+    Returns nothing for fewer than ``min_cards`` cards, where "most
+    cards" says little.
+    """
+    counts: Counter[str] = Counter()
+    n = 0
+    for card in cards:
+        titles, tags, hook = card_features(card)
+        counts.update(titles | tags | hook)
+        n += 1
+    if n < min_cards:
+        return frozenset()
+    return frozenset(word for word, count in counts.items() if count > max_df * n)
+
+
+class MinHasher:
+    """Computes ``num_perm``-value MinHash signatures for feature sets."""
+
+    def __init__(self, num_perm: int = 120, seed: int = 1, common: frozenset[str] = frozenset()) -> None:
+        if num_perm < 3:
+            raise ValueError("num_perm must be at least 3")
+        self.common = common
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.seed = seed
+        self._a = rng.integers(1, _MAX_A, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+    def signature(self, features: Iterable[str], start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Signature of one feature set over permutations ``start:stop``, as uint64.
+
+        An empty set gives a slice of a sentinel value that
+        :func:`similarity` and :class:`LSHIndex` leave out.
+        """
+        a = self._a[start:stop]
+        b = self._b[start:stop]
+        hashed = np.fromiter({zlib.crc32(f.encode("utf-8")) for f in features}, dtype=np.uint64)
+        if hashed.size == 0:
+            return np.full(len(a), _EMPTY, dtype=np.uint64)
+        values = (a[:, None] * hashed[None, :] + b[:, None]) % _PRIME
+        return values.min(axis=1)
+
+    def card_signature(self, card: Card) -> np.ndarray:
+        """Concatenated per-field signatures of ``card``, ``(num_perm,)`` long."""
+        fields = card_features(card, self.common)
+        bounds = np.linspace(0, self.num_perm, len(fields) + 1).astype(int)
+        return np.concatenate(
+            [self.signature(f, start, stop) for f, start, stop in zip(fields, bounds[:-1], bounds[1:])]
+        )
+
+
+def similarity(sig1: np.ndarray, sig2: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures.
+
+    Fields empty on both cards are left out rather than counted as a
+    match; two cards with nothing to compare score 0.
+    """
+    both_empty = np.count_nonzero((sig1 == _EMPTY) & (sig2 == _EMPTY))
+    compared = len(sig1) - both_empty
+    if not compared:
+        return 0.0
+    return float(np.count_nonzero(sig1 == sig2) - both_empty) / compared
+
+
+def _similarities(signature: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """:func:`similarity` of ``signature`` against each row of ``others`` at once."""
+    both_empty = np.count_nonzero((others == _EMPTY) & (signature == _EMPTY), axis=1)
+    compared = signature.shape[0] - both_empty
+    agree = np.count_nonzero(others == signature, axis=1) - both_empty
+    return np.divide(agree, compared, out=np.zeros(len(others)), where=compared > 0)
+
+
+def _bands_for(threshold: float, num_perm: int, recall: float = 0.95) -> tuple[int, int]:
+    """Pick ``(bands, rows)`` with the most rows per band that still make a
+    pair at ``threshold`` share a bucket with probability ``recall``.
+
+    More rows per band means fewer dissimilar candidates to verify.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if 1.0 - (1.0 - threshold**rows) ** bands >= recall:
+            best = (bands, rows)
+    return best
+
+
+class LSHIndex:
+    """Banded locality-sensitive hash index over MinHash signatures.
+
+    Signatures that agree on every row of at least one band land in the
+    same bucket; :meth:`query` then confirms candidates against
+    ``threshold`` using the full signature.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = 120) -> None:
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = _bands_for(threshold, num_perm)
+        self._buckets: list[dict[bytes, list[Hashable]]] = [{} for _ in range(self.bands)]
+        self._signatures: dict[Hashable, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._signatures
+
+    def _band_keys(self, signature: np.ndarray) -> Iterator[tuple[int, bytes]]:
+        if len(signature) != self.num_perm:
+            raise ValueError(f"expected a signature of {self.num_perm} values, got {len(signature)}")
+        for band in range(self.bands):
+            start = band * self.rows
+            values = signature[start : start + self.rows]
+            # Bands of an empty field would put every such card in one bucket.
+            if not (values == _EMPTY).all():
+                yield band, values.tobytes()
+
+    def add(self, key: Hashable, signature: np.ndarray) -> None:
+        """Index ``signature`` under ``key``; keys must be unique."""
+        if key in self._signatures:
+            raise KeyError(f"{key!r} is already indexed")
+        self._signatures[key] = signature
+        for band, bucket in self._band_keys(signature):
+            self._buckets[band].setdefault(bucket, []).append(key)
+
+    def remove(self, key: Hashable) -> None:
+        signature = self._signatures.pop(key)
+        for band, bucket in self._band_keys(signature):
+            keys = self._buckets[band][bucket]
+            keys.remove(key)
+            if not keys:
+                del self._buckets[band][bucket]
+
+    def signature(self, key: Hashable) -> np.ndarray:
+        return self._signatures[key]
+
+    def candidates(self, signature: np.ndarray) -> set[Hashable]:
+        """Keys sharing at least one band bucket with ``signature``."""
+        found: set[Hashable] = set()
+        for band, bucket in self._band_keys(signature):
+            found.update(self._buckets[band].get(bucket, ()))
+        return found
+
+    def query(self, signature: np.ndarray) -> list[tuple[Hashable, float]]:
+        """Indexed keys at least ``threshold`` similar to ``signature``, most similar first."""
+        keys = list(self.candidates(signature))
+        if not keys:
+            return []
+        scores = _similarities(signature, np.stack([self._signatures[key] for key in keys]))
+        hits = [(keys[i], float(scores[i])) for i in np.flatnonzero(scores >= self.threshold)]
+        hits.sort(key=lambda hit: -hit[1])
+        return hits
+
+
+def _unique(key: Hashable, taken: Container[Hashable]) -> Hashable:
+    # Cards without a path may share a headline; keep their keys apart.
+    if key not in taken:
+        return key
+    n = 2
+    while f"{key}#{n}" in taken:
+        n += 1
+    return f"{key}#{n}"
+
+
+class Deduplicator:
+    """Gatekeeper that flags cards too similar to ones already seen.
+
+    ::
+
+        dedup = Deduplicator()
+        for card in generated:
+            if dedup.admit(card):
+                write(card)
+
+    ``common`` words (see :func:`common_words`) are ignored in every card.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = 120,
+        seed: int = 1,
+        common: frozenset[str] = frozenset(),
+    ) -> None:
+        self.hasher = MinHasher(num_perm, seed, common)
+        self.index = LSHIndex(threshold, num_perm)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @staticmethod
+    def key_of(card: Card) -> Hashable:
+        """The card's file path, or its headline for cards not read from disk."""
+        return card.path or card.headline
+
+    def duplicates(self, card: Card) -> list[tuple[Hashable, float]]:
+        """Already-seen cards near-identical to ``card``, without adding it."""
+        return self.index.query(self.hasher.card_signature(card))
+
+    def add(self, card: Card, key: Hashable | None = None) -> None:
+        key = _unique(self.key_of(card) if key is None else key, self.index)
+        self.index.add(key, self.hasher.card_signature(card))
+
+    def admit(self, card: Card, key: Hashable | None = None) -> bool:
+        """Add ``card`` and return True, unless it near-duplicates a seen card."""
+        signature = self.hasher.card_signature(card)
+        if self.index.query(signature):
+            return False
+        self.index.add(_unique(self.key_of(card) if key is None else key, self.index), signature)
+        return True
+
+
+def find_duplicates(
+    cards: Iterable[Card],
+    threshold: float = DEFAULT_THRESHOLD,
+    num_perm: int = 120,
+    seed: int = 1,
+    sample: int = 1000,
+) -> list[list[Hashable]]:
+    """Group ``cards`` into clusters of near-duplicates.
+
+    The first ``sample`` cards decide the :func:`common_words` left out
+    of every card.  Clusters never chain: a card joins the cluster of the
+    most similar earlier cluster *leader* (its first card) above
+    ``threshold``, or starts its own, and only leaders are indexed.
+    Only clusters with two or more cards are returned, largest first,
+    leader first.  Cards are keyed as in :meth:`Deduplicator.key_of`.
+    """
+    cards = iter(cards)
+    head = list(itertools.islice(cards, sample))
+    dedup = Deduplicator(threshold, num_perm, seed, common_words(head))
+    clusters: dict[Hashable, list[Hashable]] = {}
+    seen: set[Hashable] = set()
+
+    index = dedup.index
+    with profiling.stage("dedup") as timer:
+        for card in itertools.chain(head, cards):
+            signature = dedup.hasher.card_signature(card)
+            key = _unique(dedup.key_of(card), seen)
+            seen.add(key)
+            hits = index.query(signature)
+            if hits:
+                clusters[hits[0][0]].append(key)
+            else:
+                index.add(key, signature)
+                clusters[key] = [key]
+        timer.items = len(seen)
+
+    return sorted((c for c in clusters.values() if len(c) > 1), key=len, reverse=True)
@@ -0,0 +1,332 @@
+"""Incremental on-disk index of idea cards.
+
+The index is a single SQLite file.  :meth:`CardIndex.scan` compares each
+file's ``mtime``/size with what was recorded on the previous scan and only
+re-reads files that changed; a changed file whose content hash still
+matches is not re-parsed either.  Text queries go through an FTS5 table
+(accent-insensitive) when the SQLite build provides it, and fall back to
+``LIKE`` over the folded search text otherwise.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+from collections.abc import Iterable, Iterator
+
+from . import profiling
+from .card import Card, CardParseError, Title, iter_card_paths, parse_lines
+from .text import terms
+
+__all__ = ["CardIndex", "ScanReport"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cards (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    headline TEXT NOT NULL,
+    score REAL NOT NULL,
+    date TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    hashtags TEXT NOT NULL,
+    hook TEXT NOT NULL,
+    search TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cards_strategy_score ON cards (strategy, score);
+CREATE INDEX IF NOT EXISTS cards_score ON cards (score);
+CREATE TABLE IF NOT EXISTS titles (
+    card_id INTEGER NOT NULL REFERENCES cards (id) ON DELETE CASCADE,
+    number INTEGER NOT NULL,
+    pillar TEXT NOT NULL,
+    text TEXT NOT NULL,
+    chars INTEGER NOT NULL,
+    PRIMARY KEY (card_id, number)
+);
+"""
+
+_FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS cards_fts USING fts5("
+    "search, content='cards', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+)
+
+# Lists are stored newline-joined; tags never contain newlines.
+_SEP = "\n"
+
+
+class ScanReport:
+    """What a :meth:`CardIndex.scan` call did."""
+
+    __slots__ = ("seen", "parsed", "unchanged", "removed", "errors")
+
+    def __init__(self) -> None:
+        self.seen = 0
+        self.parsed = 0
+        self.unchanged = 0
+        self.removed = 0
+        self.errors: list[tuple[str, str]] = []
+
+    def __repr__(self) -> str:
+        return (
+            f"ScanReport(seen={self.seen}, parsed={self.parsed}, unchanged={self.unchanged}, "
+            f"removed={self.removed}, errors={len(self.errors)})"
+        )
+
+
+class CardIndex:
+    """SQLite-backed index over a folder of idea cards.
+
+    Use as a context manager, or call :meth:`close` when done::
+
+        with CardIndex("cards.db") as index:
+            index.scan("outputs/Lista de ideias")
+            hits = index.query(strategy="Browse", min_score=8.5, mention="openclaw tokens")
+    """
+
+    def __init__(self, db_path: str | os.PathLike[str] = ":memory:") -> None:
+        self._db = sqlite3.connect(os.fspath(db_path))
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.executescript(_SCHEMA)
+        try:
+            self._db.execute(_FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
+        self._db.commit()
+
+    def __enter__(self) -> CardIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT count(*) FROM cards").fetchone()[0]
+
+    # -- updating -------------------------------------------------------
+
+    def scan(self, directory: str | os.PathLike[str], prune: bool = True) -> ScanReport:
+        """Bring the index up to date with the ``*.md`` files under ``directory``.
+
+        Files that fail to parse are recorded in :attr:`ScanReport.errors`
+        and left out of the index.  With ``prune``, cards whose file has
+        disappeared from ``directory`` are dropped.
+        """
+        with profiling.stage("index.scan") as timer:
+            report = self._scan(directory, prune)
+            timer.items = report.seen
+        profiling.active().count("index.parsed", report.parsed)
+        return report
+
+    def _scan(self, directory: str | os.PathLike[str], prune: bool) -> ScanReport:
+        report = ScanReport()
+        root = os.path.abspath(directory)
+        known = {
+            path: (card_id, mtime_ns, size, digest)
+            for card_id, path, mtime_ns, size, digest in self._db.execute(
+                "SELECT id, path, mtime_ns, size, digest FROM cards WHERE path LIKE ? ESCAPE '\\'",
+                (_like_prefix(root + os.sep),),
+            )
+        }
+
+        with self._db:
+            for entry in iter_card_paths(root):
+                report.seen += 1
+                path = os.path.abspath(entry.path)
+                stat = entry.stat()
+                previous = known.pop(path, None)
+                if previous is not None and previous[1:3] == (stat.st_mtime_ns, stat.st_size):
+                    report.unchanged += 1
+                    continue
+
+                with open(path, "rb") as fh:
+                    data = fh.read()
+                digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+                if previous is not None and previous[3] == digest:
+                    self._db.execute(
+                        "UPDATE cards SET mtime_ns = ?, size = ? WHERE id = ?",
+                        (stat.st_mtime_ns, stat.st_size, previous[0]),
+                    )
+                    report.unchanged += 1
+                    continue
+
+                try:
+                    card = parse_lines(data.decode("utf-8").splitlines(), path)
+                except (CardParseError, UnicodeDecodeError) as exc:
+                    report.errors.append((path, str(exc)))
+                    if previous is not None:
+                        self._delete(previous[0])
+                    continue
+                self._store(card, path, stat.st_mtime_ns, stat.st_size, digest, previous and previous[0])
+                report.parsed += 1
+
+            if prune:
+                for card_id, *_ in known.values():
+                    self._delete(card_id)
+                    report.removed += 1
+        return report
+
+    def add(self, card: Card) -> None:
+        """Index an in-memory card; ``card.path`` is required as its key.
+
+        The path is made absolute, as :meth:`scan` and :meth:`get` do.
+        """
+        if card.path is None:
+            raise ValueError("card.path is required to index a card")
+        path = os.path.abspath(card.path)
+        row = self._db.execute("SELECT id FROM cards WHERE path = ?", (path,)).fetchone()
+        with self._db:
+            self._store(card, path, 0, 0, "", row and row[0])
+
+    def _store(
+        self, card: Card, path: str, mtime_ns: int, size: int, digest: str, card_id: int | None
+    ) -> None:
+        search = card.search_text()
+        if card_id is not None:
+            self._delete(card_id)
+        cur = self._db.execute(
+            "INSERT INTO cards (path, mtime_ns, size, digest, headline, score, date, strategy,"
+            " tags, hashtags, hook, search) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                path,
+                mtime_ns,
+                size,
+                digest,
+                card.headline,
+                card.score,
+                card.date,
+                card.strategy,
+                _SEP.join(card.tags),
+                _SEP.join(card.hashtags),
+                card.hook,
+                search,
+            ),
+        )
+        card_id = cur.lastrowid
+        self._db.executemany(
+            "INSERT INTO titles (card_id, number, pillar, text, chars) VALUES (?, ?, ?, ?, ?)",
+            [(card_id, t.number, t.pillar, t.text, t.chars) for t in card.titles],
+        )
+        if self.has_fts:
+            self._db.execute("INSERT INTO cards_fts (rowid, search) VALUES (?, ?)", (card_id, search))
+
+    def _delete(self, card_id: int) -> None:
+        if self.has_fts:
+            search = self._db.execute("SELECT search FROM cards WHERE id = ?", (card_id,)).fetchone()
+            if search is not None:
+                self._db.execute(
+                    "INSERT INTO cards_fts (cards_fts, rowid, search) VALUES ('delete', ?, ?)",
+                    (card_id, search[0]),
+                )
+        self._db.execute("DELETE FROM cards WHERE id = ?", (card_id,))
+
+    # -- querying -------------------------------------------------------
+
+    def query(
+        self,
+        strategy: str | None = None,
+        min_score: float | None = None,
+        max_score: float | None = None,
+        mention: str | None = None,
+        limit: int | None = None,
+    ) -> list[Card]:
+        """Return indexed cards matching every given filter, best score first.
+
+        ``mention`` matches cards whose headline, titles, tags, hashtags or
+        hook contain every term of the string, ignoring case and accents.
+        """
+        where: list[str] = []
+        params: list[object] = []
+        if strategy is not None:
+            where.append("c.strategy = ?")
+            params.append(strategy)
+        if min_score is not None:
+            where.append("c.score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            where.append("c.score <= ?")
+            params.append(max_score)
+
+        words = terms(mention) if mention else []
+        if words and self.has_fts:
+            # As a subquery the MATCH runs once; joined against cards, SQLite
+            # may drive from the strategy/score index and re-run it per row.
+            where.append("c.id IN (SELECT rowid FROM cards_fts WHERE cards_fts MATCH ?)")
+            params.append(" ".join(f'"{word}"*' for word in words))
+        else:
+            for word in words:
+                where.append("c.search LIKE ? ESCAPE '\\'")
+                params.append(f"%{_like_escape(word)}%")
+
+        sql = (
+            "SELECT c.id, c.path, c.headline, c.score, c.date, c.strategy, c.tags, c.hashtags, c.hook"
+            " FROM cards c"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY c.score DESC, c.path"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._cards(self._db.execute(sql, params).fetchall())
+
+    def get(self, path: str | os.PathLike[str]) -> Card | None:
+        """Return the indexed card stored for ``path``, if any."""
+        rows = self._db.execute(
+            "SELECT id, path, headline, score, date, strategy, tags, hashtags, hook"
+            " FROM cards WHERE path = ?",
+            (os.path.abspath(path),),
+        ).fetchall()
+        cards = self._cards(rows)
+        return cards[0] if cards else None
+
+    def __iter__(self) -> Iterator[Card]:
+        rows = self._db.execute(
+            "SELECT id, path, headline, score, date, strategy, tags, hashtags, hook FROM cards ORDER BY path"
+        ).fetchall()
+        return iter(self._cards(rows))
+
+    def _cards(self, rows: Iterable[tuple]) -> list[Card]:
+        rows = list(rows)
+        titles: dict[int, list[Title]] = {row[0]: [] for row in rows}
+        ids = list(titles)
+        # Stay under SQLITE_MAX_VARIABLE_NUMBER on older builds.
+        for start in range(0, len(ids), 900):
+            chunk = ids[start : start + 900]
+            for card_id, number, pillar, text, chars in self._db.execute(
+                "SELECT card_id, number, pillar, text, chars FROM titles"
+                f" WHERE card_id IN ({','.join('?' * len(chunk))}) ORDER BY card_id, number",
+                chunk,
+            ):
+                titles[card_id].append(Title(number, pillar, text, chars))
+        return [
+            Card(
+                headline=headline,
+                score=score,
+                date=date,
+                strategy=strategy,
+                titles=tuple(titles[card_id]),
+                tags=tuple(tags.split(_SEP)) if tags else (),
+                hashtags=tuple(hashtags.split(_SEP)) if hashtags else (),
+                hook=hook,
+                path=path,
+            )
+            for card_id, path, headline, score, date, strategy, tags, hashtags, hook in rows
+        ]
+
+
+def _like_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _like_prefix(prefix: str) -> str:
+    return _like_escape(prefix) + "%"
+
@@ -0,0 +1,360 @@
+"""Concurrent card generation.
+
+A card needs five model calls: titles, tags, hashtags and hook are
+independent of each other, and the score is asked for once the titles
+and hook exist.  :class:`Pipeline` runs those stages for many topics at
+once with asyncio: each stage has its own semaphore (so a slow or
+rate-limited stage can be throttled without starving the others), failed
+calls are retried with exponential backoff, and wall time ends up bounded
+by the slowest stage rather than the sum of all calls.
+
+Models are reached through a :class:`Backend`; :class:`FakeBackend` is a
+deterministic local stand-in for tests and dry runs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import hashlib
+import random
+import re
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping
+from typing import Protocol, TypeVar
+
+from . import profiling
+from .card import PILLARS, STRATEGIES, Card, Title
+from .titlelen import measure
+
+__all__ = [
+    "STAGES",
+    "Backend",
+    "BackendError",
+    "Completion",
+    "FakeBackend",
+    "GenerationError",
+    "Pipeline",
+    "Topic",
+    "build_prompt",
+    "generate",
+]
+
+STAGES = ("titles", "tags", "hashtags", "hook", "score")
+
+_STRATEGY_HINTS = {
+    "Browse": "para a home e recomendados: emoção e curiosidade acima de palavras-chave",
+    "Search": "para a busca do YouTube: palavras-chave explícitas que as pessoas digitam",
+}
+
+_PROMPTS = {
+    "titles": (
+        "Escreva 5 títulos de até 45 caracteres para o vídeo \"{headline}\" ({hint}), "
+        "um por pilar emocional, na ordem: {pillars}. "
+        "Responda uma linha por título no formato 'Pilar | Título'."
+    ),
+    "tags": (
+        "Liste 12 tags de busca do YouTube para o vídeo \"{headline}\" ({hint}), "
+        "separadas por vírgula, em minúsculas."
+    ),
+    "hashtags": "Sugira 3 hashtags para o vídeo \"{headline}\", separadas por espaço.",
+    "hook": (
+        "Escreva o gancho dos primeiros 30 segundos do vídeo \"{headline}\" ({hint}), "
+        "em um parágrafo, falando direto com o espectador."
+    ),
+    "score": (
+        "Dê uma nota de 0 a 10 para o potencial de cliques do vídeo \"{headline}\" ({strategy}) "
+        "com estes títulos:\n{titles}\ne este gancho:\n{hook}\n"
+        "Responda só com o número."
+    ),
+}
+
+_T = TypeVar("_T")
+
+_SCORE = re.compile(r"[0-9]+(?:[.,][0-9]+)?")
+
+
+class BackendError(Exception):
+    """A model call failed in a way worth retrying (rate limit, timeout, 5xx)."""
+
+
+class GenerationError(Exception):
+    """A topic could not be turned into a card after all retries."""
+
+    def __init__(self, topic: Topic, stage: str, cause: BaseException) -> None:
+        super().__init__(f"{topic.headline!r}: stage {stage!r} failed: {cause}")
+        self.topic = topic
+        self.stage = stage
+        self.cause = cause
+
+
+class Topic:
+    """A video idea to generate a card for."""
+
+    __slots__ = ("headline", "strategy")
+
+    def __init__(self, headline: str, strategy: str = "Browse") -> None:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unknown strategy {strategy!r}, expected one of {STRATEGIES}")
+        self.headline = headline
+        self.strategy = strategy
+
+    def __repr__(self) -> str:
+        return f"Topic({self.headline!r}, {self.strategy!r})"
+
+
+class Completion:
+    """A model response and what it cost."""
+
+    __slots__ = ("text", "prompt_tokens", "completion_tokens")
+
+    def __init__(self, text: str, prompt_tokens: int = 0, completion_tokens: int = 0) -> None:
+        self.text = text
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+    def __repr__(self) -> str:
+        return (
+            f"Completion({self.text[:40]!r}, prompt_tokens={self.prompt_tokens}, "
+            f"completion_tokens={self.completion_tokens})"
+        )
+
+
+class Backend(Protocol):
+    """Anything that can answer a prompt.
+
+    ``stage`` is one of :data:`STAGES`, passed so backends can route or
+    meter stages differently.  Raise :class:`BackendError` for failures
+    that should be retried.
+    """
+
+    model: str
+
+    async def complete(self, prompt: str, *, stage: str, **params: object) -> Completion: ...
+
+
+def build_prompt(stage: str, topic: Topic, titles: Iterable[Title] = (), hook: str = "") -> str:
+    """The prompt sent for ``stage`` of ``topic``."""
+    return _PROMPTS[stage].format(
+        headline=topic.headline,
+        strategy=topic.strategy,
+        hint=_STRATEGY_HINTS[topic.strategy],
+        pillars=", ".join(PILLARS),
+        titles="\n".join(t.text for t in titles),
+        hook=hook,
+    )
+
+
+def _parse_titles(text: str) -> tuple[Title, ...]:
+    titles = []
+    for line in text.splitlines():
+        pillar, sep, title = line.partition("|")
+        if not sep:
+            continue
+        pillar, title = pillar.strip(" -*0123456789."), title.strip()
+        if title:
+            titles.append(Title(len(titles) + 1, pillar, title, measure(title).chars))
+    return tuple(titles)
+
+
+def _parse_list(text: str, sep: str | None) -> tuple[str, ...]:
+    items = text.replace("\n", sep or " ").split(sep)
+    return tuple(item.strip() for item in items if item.strip())
+
+
+def _parse_score(text: str) -> float:
+    match = _SCORE.search(text)
+    if match is None:
+        raise BackendError(f"no score in response {text[:40]!r}")
+    return min(max(float(match.group().replace(",", ".")), 0.0), 10.0)
+
+
+class Pipeline:
+    """Generates cards for many topics concurrently.
+
+    ``limits`` caps concurrent calls per stage (stages not listed use
+    ``default_limit``); ``max_topics`` caps how many topics are in flight
+    at once, which bounds memory on very large runs.  Each call is retried
+    up to ``retries`` times on :class:`BackendError` or timeout, sleeping
+    ``backoff * 2**attempt`` seconds (with jitter) in between.
+    """
+
+    def __init__(
+        self,
+        backend: Backend,
+        limits: Mapping[str, int] | None = None,
+        default_limit: int = 8,
+        max_topics: int = 64,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float | None = 60.0,
+        date: str | None = None,
+        admit: Callable[[Card], bool] | None = None,
+    ) -> None:
+        unknown = set(limits or ()) - set(STAGES)
+        if unknown:
+            raise ValueError(f"unknown stages in limits: {sorted(unknown)}")
+        self.backend = backend
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.date = date
+        self.admit = admit
+        self.max_topics = max_topics
+        self._limits = {stage: (limits or {}).get(stage, default_limit) for stage in STAGES}
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, stage: str) -> asyncio.Semaphore:
+        # Created lazily so they bind to the running event loop.
+        if stage not in self._semaphores:
+            self._semaphores[stage] = asyncio.Semaphore(self._limits[stage])
+        return self._semaphores[stage]
+
+    async def _call(self, stage: str, prompt: str) -> str:
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore(stage):
+                    with profiling.stage(f"generate.{stage}"):
+                        call = self.backend.complete(prompt, stage=stage)
+                        completion = await asyncio.wait_for(call, self.timeout)
+                return completion.text
+            except (BackendError, asyncio.TimeoutError):
+                profiling.active().count(f"generate.{stage}.failed")
+                if attempt >= self.retries:
+                    raise
+                delay = self.backoff * 2**attempt
+                await asyncio.sleep(delay + random.uniform(0, delay / 2))
+                attempt += 1
+
+    async def _stage(self, topic: Topic, stage: str, parse: Callable[[str], _T], **extra: object) -> _T:
+        prompt = build_prompt(stage, topic, **extra)
+        try:
+            return parse(await self._call(stage, prompt))
+        except (BackendError, asyncio.TimeoutError) as exc:
+            raise GenerationError(topic, stage, exc) from exc
+
+    async def generate_card(self, topic: Topic) -> Card:
+        """Run every stage for one topic and assemble its card."""
+        titles, tags, hashtags, hook = await asyncio.gather(
+            self._stage(topic, "titles", _parse_titles),
+            self._stage(topic, "tags", lambda text: _parse_list(text, ",")),
+            self._stage(topic, "hashtags", lambda text: _parse_list(text, None)),
+            self._stage(topic, "hook", lambda text: text.strip().strip('"')),
+        )
+        score = await self._stage(topic, "score", _parse_score, titles=titles, hook=hook)
+        return Card(
+            headline=topic.headline,
+            score=score,
+            date=self.date or datetime.date.today().isoformat(),
+            strategy=topic.strategy,
+            titles=titles,
+            tags=tags,
+            hashtags=tuple(h if h.startswith("#") else "#" + h for h in hashtags),
+            hook=hook,
+        )
+
+    async def stream(self, topics: Iterable[Topic]) -> AsyncIterator[Card | GenerationError]:
+        """Yield each card (or the error that stopped it) as soon as it is done.
+
+        Results come in completion order, not topic order.  Cards rejected
+        by ``admit`` are dropped.
+        """
+        topics = iter(topics)
+        pending: set[asyncio.Task[Card]] = set()
+
+        def refill() -> None:
+            for topic in topics:
+                pending.add(asyncio.ensure_future(self.generate_card(topic)))
+                if len(pending) >= self.max_topics:
+                    break
+
+        refill()
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                refill()
+                for task in done:
+                    exc = task.exception()
+                    if isinstance(exc, GenerationError):
+                        yield exc
+                    elif exc is not None:
+                        raise exc
+                    else:
+                        card = task.result()
+                        if self.admit is None or self.admit(card):
+                            yield card
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def run(self, topics: Iterable[Topic]) -> tuple[list[Card], list[GenerationError]]:
+        """Generate cards for every topic; return the cards and the failures."""
+        cards: list[Card] = []
+        errors: list[GenerationError] = []
+        async for result in self.stream(topics):
+            (errors if isinstance(result, GenerationError) else cards).append(result)
+        return cards, errors
+
+
+def generate(
+    topics: Iterable[Topic], backend: Backend, **options: object
+) -> tuple[list[Card], list[GenerationError]]:
+    """Synchronous wrapper around :meth:`Pipeline.run`."""
+    return asyncio.run(Pipeline(backend, **options).run(topics))
+
+
+class FakeBackend:
+    """Deterministic offline backend.
+
+    Answers are derived from a hash of the prompt, so the same prompt
+    always gets the same answer.  ``latency`` (seconds per call) and
+    ``failure_rate`` simulate a real API; failures raise
+    :class:`BackendError` and are seeded by ``seed``.
+    """
+
+    model = "fake"
+
+    _EMOJI = ("🔍", "⚠️", "🚀", "🤯", "🔥")
+    _WORDS = ("REALMENTE", "NINGUÉM", "CUIDADO", "GRÁTIS", "SEGREDO", "AGORA", "TUDO", "ERRO")
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0, seed: int = 0) -> None:
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    async def complete(self, prompt: str, *, stage: str, **params: object) -> Completion:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise BackendError("simulated failure")
+        digest = hashlib.blake2b(prompt.encode("utf-8"), digest_size=8).digest()
+        text = self._answer(stage, prompt, digest)
+        return Completion(text, prompt_tokens=len(prompt) // 4, completion_tokens=len(text) // 4)
+
+    def _answer(self, stage: str, prompt: str, digest: bytes) -> str:
+        subject = re.search(r'"([^"]+)"', prompt)
+        words = (subject.group(1) if subject else "OpenClaw").split()
+        name = words[0].rstrip(":,") if words else "OpenClaw"
+        if stage == "titles":
+            return "\n".join(
+                f"{pillar} | {emoji} {name}: o {self._WORDS[(digest[i] + i) % len(self._WORDS)]} "
+                f"que {('ninguém mostra', 'você precisa ver', 'muda tudo')[digest[i] % 3]}"
+                for i, (pillar, emoji) in enumerate(zip(PILLARS, self._EMOJI))
+            )
+        if stage == "tags":
+            base = name.lower()
+            extra = ("tutorial", "review", "como usar", "vale a pena", "passo a passo", "guia",
+                     "dicas", "erros", "custo", "instalação", "2026", "iniciante")
+            return ", ".join([base] + [f"{base} {word}" for word in extra[:11]])
+        if stage == "hashtags":
+            return f"#{name} #IA #Tutorial"
+        if stage == "hook":
+            return (
+                f'"Você já ouviu falar do {name}? Eu testei por uma semana e o resultado '
+                f'me surpreendeu. Nesse vídeo eu vou te mostrar TUDO o que descobri."'
+            )
+        if stage == "score":
+            return f"{7.5 + (digest[0] % 15) / 10:.1f}"
+        raise ValueError(f"unknown stage {stage!r}")
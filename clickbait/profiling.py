@@ -0,0 +1,217 @@
+"""Opt-in timing and memory instrumentation.
+
+Hot paths wrap their work in ``with profiling.stage("name", items):``.
+By default that does nothing beyond entering a trivial context manager;
+inside
+``with profiling.enabled(Profiler()) as prof:`` every stage is timed into
+counters and a latency histogram, and, when asked for, tracemalloc peaks
+and cProfile dumps are collected too.  :meth:`Profiler.report` returns
+everything as a JSON-ready dict::
+
+    with profiling.enabled(Profiler(memory=True)) as prof:
+        index.scan("outputs/Lista de ideias")
+    prof.write_json("profile.json")
+"""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import json
+import math
+import os
+import re
+import time
+import tracemalloc
+from collections.abc import Iterator
+
+__all__ = ["Histogram", "Profiler", "StageTimer", "active", "enabled", "stage"]
+
+
+class StageTimer:
+    """Handle yielded by ``stage()``.
+
+    Set ``items`` inside the block when the count is only known at the
+    end; ``elapsed`` is filled in on exit.
+    """
+
+    __slots__ = ("items", "elapsed")
+
+    def __init__(self, items: int) -> None:
+        self.items = items
+        self.elapsed = 0.0
+
+
+class Histogram:
+    """Latency histogram with power-of-two microsecond buckets."""
+
+    __slots__ = ("buckets", "count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        micros = seconds * 1e6
+        bucket = 0 if micros < 1 else int(math.log2(micros)) + 1
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        """Approximate ``q`` quantile in seconds (upper edge of its bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min((2**bucket) / 1e6, self.max)
+        return self.max
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "count": self.count,
+            "total_s": self.total,
+            "mean_s": self.total / self.count if self.count else 0.0,
+            "min_s": self.min if self.count else 0.0,
+            "max_s": self.max,
+            "p50_s": self.quantile(0.5),
+            "p99_s": self.quantile(0.99),
+            # Keys are bucket upper bounds in microseconds.
+            "buckets_us": {str(2**b): n for b, n in sorted(self.buckets.items())},
+        }
+
+
+class _StageStats:
+    __slots__ = ("histogram", "items", "peak_bytes")
+
+    def __init__(self) -> None:
+        self.histogram = Histogram()
+        self.items = 0
+        self.peak_bytes = 0
+
+
+class Profiler:
+    """Collects per-stage timings, item counts and optional memory peaks.
+
+    ``memory`` turns on tracemalloc and records each stage's peak
+    allocation (nested stages reset the peak, so an outer figure only
+    covers what ran after its last inner stage).  ``cprofile_dir`` writes
+    one ``<stage>.prof`` cProfile dump per stage name, for the first call
+    of each (non-nested) stage only to keep overhead bounded.
+    """
+
+    def __init__(self, memory: bool = False, cprofile_dir: str | os.PathLike[str] | None = None) -> None:
+        self.memory = memory
+        self.cprofile_dir = os.fspath(cprofile_dir) if cprofile_dir is not None else None
+        self.counters: dict[str, int] = {}
+        self._stages: dict[str, _StageStats] = {}
+        self._profiled: set[str] = set()
+        self._profiling = False
+        self._started = time.perf_counter()
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextlib.contextmanager
+    def stage(self, name: str, items: int = 1) -> Iterator[StageTimer]:
+        timer = StageTimer(items)
+        stats = self._stages.get(name)
+        if stats is None:
+            stats = self._stages[name] = _StageStats()
+        profile = None
+        # Only one cProfile can run at a time, so nested stages are skipped.
+        if self.cprofile_dir is not None and name not in self._profiled and not self._profiling:
+            self._profiled.add(name)
+            self._profiling = True
+            profile = cProfile.Profile()
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        if profile is not None:
+            profile.enable()
+        started = time.perf_counter()
+        try:
+            yield timer
+        finally:
+            elapsed = timer.elapsed = time.perf_counter() - started
+            if profile is not None:
+                profile.disable()
+                self._profiling = False
+                os.makedirs(self.cprofile_dir, exist_ok=True)
+                filename = re.sub(r"[^\w.-]+", "_", name) + ".prof"
+                profile.dump_stats(os.path.join(self.cprofile_dir, filename))
+            stats.histogram.add(elapsed)
+            stats.items += timer.items
+            if self.memory:
+                stats.peak_bytes = max(stats.peak_bytes, tracemalloc.get_traced_memory()[1] - base)
+
+    def report(self) -> dict[str, object]:
+        stages = {}
+        for name, stats in self._stages.items():
+            entry = stats.histogram.as_dict()
+            entry["items"] = stats.items
+            total = stats.histogram.total
+            entry["items_per_s"] = stats.items / total if total > 0 else None
+            if self.memory:
+                entry["peak_bytes"] = stats.peak_bytes
+            stages[name] = entry
+        return {
+            "wall_s": time.perf_counter() - self._started,
+            "counters": dict(self.counters),
+            "stages": stages,
+        }
+
+    def write_json(self, path: str | os.PathLike[str]) -> None:
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.report(), fh, indent=2, sort_keys=True)
+            fh.write("\n")
+
+
+class _NullProfiler:
+    """Stand-in used while profiling is off; every hook does nothing."""
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+    @contextlib.contextmanager
+    def stage(self, name: str, items: int = 1) -> Iterator[StageTimer]:
+        yield StageTimer(items)
+
+
+_NULL = _NullProfiler()
+_active: Profiler | _NullProfiler = _NULL
+
+
+def active() -> Profiler | _NullProfiler:
+    """The profiler hooks currently report to."""
+    return _active
+
+
+def stage(name: str, items: int = 1) -> contextlib.AbstractContextManager[StageTimer]:
+    """Time the enclosed block as ``name``, covering ``items`` units of work."""
+    return _active.stage(name, items)
+
+
+@contextlib.contextmanager
+def enabled(profiler: Profiler) -> Iterator[Profiler]:
+    """Route every hook to ``profiler`` for the duration of the block."""
+    global _active
+    previous = _active
+    _active = profiler
+    started_tracing = profiler.memory and not tracemalloc.is_tracing()
+    try:
+        yield profiler
+    finally:
+        _active = previous
+        if started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
@@ -0,0 +1,310 @@
+"""Bulk card rendering and atomic batch writes.
+
+:class:`CardTemplate` compiles the card layout once into a rendering
+function, so exporting thousands of cards never re-parses the layout.
+:class:`CardWriter` writes a batch in two phases: every card goes to a
+hidden temp file next to its destination (optionally on several
+threads), and only once all of them are on disk are they renamed into
+place.  A crash mid-batch leaves at most stray ``*.tmp`` files, never a
+half-written card, and a failed batch removes its temp files.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import string
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+from . import profiling
+from .card import Card
+from .text import slugify
+
+__all__ = [
+    "CARD_TEMPLATE",
+    "CardTemplate",
+    "CardWriter",
+    "render_card",
+    "write_atomic",
+]
+
+#: The layout of every card in ``outputs/Lista de ideias``.
+CARD_TEMPLATE = """\
+# 🎬 {headline}
+
+**Score**: {score}/10 | **Data**: {date} | **Estratégia**: {strategy}
+
+---
+
+## 🎯 TÍTULOS (5 Pilares Emocionais)
+
+| # | Pilar | Título | Chars |
+|---|-------|--------|-------|
+{titles}
+---
+
+## 🏷️ TAGS
+{tags}
+
+---
+
+## #️⃣ HASHTAGS
+{hashtags}
+
+---
+
+## 🎬 HOOK (primeiros 30s)
+
+"{hook}"
+"""
+
+TITLE_ROW = "| {number} | {pillar} | {text} | {chars} |\n"
+
+# Template fields and the Python expression each one compiles to.  The
+# card's are evaluated with ``card``, ``rows``, ``tags`` and ``hashtags``
+# in scope; a title row's with ``t``.
+_CARD_FIELDS = {
+    "headline": "card.headline",
+    "score": "card.score:.1f",
+    "date": "card.date",
+    "strategy": "card.strategy",
+    "titles": "rows",
+    "tags": "tags",
+    "hashtags": "hashtags",
+    "hook": "card.hook",
+}
+_TITLE_FIELDS = {"number": "t.number", "pillar": "t.pillar", "text": "t.text", "chars": "t.chars"}
+
+_TEMP_PREFIX = ".clickbait-"
+_TEMP_SUFFIX = ".tmp"
+_temp_ids = itertools.count()
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
+
+
+def _fstring(template: str, fields: dict[str, str]) -> str:
+    """Translate ``template`` into the source of an equivalent f-string expression."""
+    pieces = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if literal:
+            pieces.append(repr(literal))
+        if field is None:
+            continue
+        if spec or conversion:
+            raise ValueError(f"format specs are not supported in templates: {{{field}}}")
+        if field not in fields:
+            raise ValueError(f"unknown template field {field!r}")
+        pieces.append("f" + repr("{" + fields[field] + "}"))
+    return "(" + " ".join(pieces or ["''"]) + ")"
+
+
+class CardTemplate:
+    """A compiled card template.
+
+    ``template`` may use ``{headline}``, ``{score}``, ``{date}``,
+    ``{strategy}``, ``{titles}``, ``{tags}``, ``{hashtags}`` and
+    ``{hook}``; ``{titles}`` expands to one ``row`` per title, which may
+    use ``{number}``, ``{pillar}``, ``{text}`` and ``{chars}``.  Both are
+    compiled once into a Python function built around an f-string, so a
+    card renders as fast as hand-written formatting.
+    """
+
+    def __init__(self, template: str = CARD_TEMPLATE, row: str = TITLE_ROW) -> None:
+        source = (
+            "def render(card):\n"
+            f"    rows = ''.join([{_fstring(row, _TITLE_FIELDS)} for t in card.titles])\n"
+            "    tags = ', '.join(card.tags)\n"
+            "    hashtags = ' '.join(card.hashtags)\n"
+            f"    return {_fstring(template, _CARD_FIELDS)}\n"
+        )
+        namespace: dict = {}
+        exec(compile(source, "<card template>", "exec"), namespace)
+        self.render = namespace["render"]
+
+    def render_many(self, cards: Iterable[Card]) -> list[str]:
+        return list(map(self.render, cards))
+
+
+_DEFAULT = CardTemplate()
+
+
+def render_card(card: Card) -> str:
+    """Render ``card`` with the default template."""
+    return _DEFAULT.render(card)
+
+
+def _temp_path(path: str) -> str:
+    directory, name = os.path.split(path)
+    return os.path.join(
+        directory, f"{_TEMP_PREFIX}{name}.{os.getpid()}.{next(_temp_ids)}{_TEMP_SUFFIX}"
+    )
+
+
+def _write_temp(path: str, text: str, fsync: bool) -> str:
+    temp = _temp_path(path)
+    data = text.encode("utf-8")
+    try:
+        fd = os.open(temp, _WRITE_FLAGS, 0o644)
+        try:
+            # Large cards may need more than one write.
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            if fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+    except BaseException:
+        _remove_quietly(temp)
+        raise
+    return temp
+
+
+def _writer_alive(temp_name: str) -> bool:
+    """Whether the process that named ``temp_name`` (``....<pid>.<n>.tmp``) still runs."""
+    try:
+        pid = int(temp_name.rsplit(".", 3)[1])
+    except (IndexError, ValueError):
+        return True
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # No permission to signal it (or no such check here): assume alive
+        # and let max_age decide.
+        return True
+    return True
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def write_atomic(path: str | os.PathLike[str], text: str, fsync: bool = False) -> None:
+    """Replace ``path`` with ``text`` via a temp file and rename."""
+    path = os.fspath(path)
+    os.replace(_write_temp(path, text, fsync), path)
+
+
+class CardWriter:
+    """Writes batches of cards into ``directory`` as ``<slug>.md``.
+
+    The slug is the card's own (when it was read from disk) or
+    :func:`~clickbait.text.slugify` of its headline.  ``on_conflict``
+    decides what happens when that name is taken, either on disk or
+    earlier in the same batch: ``"suffix"`` appends ``-2``, ``-3``...;
+    ``"replace"`` overwrites; ``"skip"`` leaves the existing file alone.
+    ``workers`` > 1 renders and writes on that many threads.  Cards are
+    rendered with ``template``, the standard card layout by default.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        on_conflict: str = "suffix",
+        workers: int = 1,
+        fsync: bool = False,
+        template: CardTemplate | None = None,
+    ) -> None:
+        if on_conflict not in ("suffix", "replace", "skip"):
+            raise ValueError(f"on_conflict must be 'suffix', 'replace' or 'skip', not {on_conflict!r}")
+        self.directory = os.fspath(directory)
+        self.on_conflict = on_conflict
+        self.workers = max(1, workers)
+        self.fsync = fsync
+        self.template = template or _DEFAULT
+        os.makedirs(self.directory, exist_ok=True)
+        self._taken = {
+            name[:-3] for name in os.listdir(self.directory) if name.endswith(".md")
+        }
+        self._lock = threading.Lock()
+
+    def cleanup(self, max_age: float = 3600.0) -> int:
+        """Remove temp files left behind by interrupted batches.
+
+        A temp file is stale when the process that wrote it is gone or
+        it is older than ``max_age`` seconds; live writers' files in the
+        same directory are left alone.
+        """
+        removed = 0
+        now = time.time()
+        for entry in os.scandir(self.directory):
+            if not (entry.name.startswith(_TEMP_PREFIX) and entry.name.endswith(_TEMP_SUFFIX)):
+                continue
+            try:
+                age = now - entry.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if age > max_age or not _writer_alive(entry.name):
+                _remove_quietly(entry.path)
+                removed += 1
+        return removed
+
+    def _claim(self, card: Card) -> str | None:
+        base = card.slug or slugify(card.headline)
+        with self._lock:
+            if base not in self._taken or self.on_conflict == "replace":
+                name = base
+            elif self.on_conflict == "skip":
+                return None
+            else:
+                n = 2
+                while f"{base}-{n}" in self._taken:
+                    n += 1
+                name = f"{base}-{n}"
+            self._taken.add(name)
+        return os.path.join(self.directory, name + ".md")
+
+    def _stage(self, job: tuple[Card, str]) -> str:
+        card, path = job
+        return _write_temp(path, self.template.render(card), self.fsync)
+
+    def write_batch(self, cards: Iterable[Card]) -> list[str]:
+        """Write ``cards`` and return the paths written, in order.
+
+        Skipped cards (``on_conflict="skip"``) are left out.  If any card
+        fails to render or write, no file of the batch is renamed into
+        place and the error propagates.
+        """
+        jobs = []
+        for card in cards:
+            path = self._claim(card)
+            if path is not None:
+                jobs.append((card, path))
+
+        with profiling.stage("render+write", len(jobs)):
+            temps: list[str] = []
+            error: BaseException | None = None
+            if self.workers > 1 and len(jobs) > 1:
+                with ThreadPoolExecutor(self.workers) as pool:
+                    futures = [pool.submit(self._stage, job) for job in jobs]
+                for future in futures:
+                    if future.exception() is None:
+                        temps.append(future.result())
+                    elif error is None:
+                        error = future.exception()
+            else:
+                try:
+                    for job in jobs:
+                        temps.append(self._stage(job))
+                except BaseException as exc:
+                    error = exc
+            if error is not None:
+                for temp in temps:
+                    _remove_quietly(temp)
+                with self._lock:
+                    self._taken.difference_update(
+                        os.path.basename(path)[:-3] for _, path in jobs if not os.path.exists(path)
+                    )
+                raise error
+            for temp, (_, path) in zip(temps, jobs):
+                os.replace(temp, path)
+        return [path for _, path in jobs]
@@ -0,0 +1,248 @@
+"""Batch title scoring against the five emotional pillars.
+
+Titles are turned into a handful of feature arrays in one pass
+(:func:`extract_features`) and scored with array arithmetic
+(:class:`TitleScorer`), so ranking thousands of generated candidates costs
+a few NumPy operations rather than a Python loop of heuristics per title.
+
+The heuristics mirror what the hand-made cards do well:
+
+* length inside the 38–43 cell sweet spot (emoji count as two);
+* a leading emoji, ideally the pillar's own (🔍 ⚠️ 🚀 🤯 🔥);
+* one or two ALL-CAPS power words (``DEVOROU``, ``REALMENTE``), not more;
+* wording cues for each pillar (``ninguém``, ``cuidado``, ``grátis``...).
+
+Scores are on the same 0–10 scale as the cards' ``Score`` header.
+Requires NumPy.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Sequence
+
+import numpy as np
+
+from . import profiling
+from .card import PILLARS
+from .text import fold
+from .titlelen import measure_many
+
+__all__ = [
+    "ACRONYMS",
+    "PILLAR_CUES",
+    "PILLAR_EMOJI",
+    "ScoreBatch",
+    "TitleFeatures",
+    "TitleScorer",
+    "extract_features",
+    "score_titles",
+]
+
+#: Emoji each pillar's title starts with in the cards, by pillar index.
+PILLAR_EMOJI = ("🔍", "⚠", "🚀", "🤯", "🔥")
+
+#: Folded cues that signal each pillar, by pillar index.  A cue that starts
+#: with a letter or digit only matches at the start of a word, and a
+#: trailing space makes it match whole words only (``"so "`` is "só", not
+#: the end of "isso").
+PILLAR_CUES: tuple[tuple[str, ...], ...] = (
+    # Curiosidade
+    ("?", "segredo", "ninguem", "realmente", "quanto", "o que", "por que", "como ", "descobri", "verdade"),
+    # Medo/Urgência
+    ("cuidado", "erro", "risco", "perigo", "destruir", "seguro?", "antes de", "travam", "nunca", "pare "),
+    # Desejo/Recompensa
+    ("gratis", "barato", "domine", "truque", "100%", "minutos", "facil", "seu ", "meu ", "melhor"),
+    # Surpresa/Novidade
+    ("ninguem mostra", "muda tudo", "novo", "nova", "tem memoria", "inesperad", "chocante", "enquanto", "isso"),
+    # FOMO
+    ("99%", "devs", "todos", "e voce", "ficar pra tras", "ja estao", "estao usando", "que usam", "pro ", "so "),
+)
+
+#: Upper-case words that are acronyms rather than emphasis.
+ACRONYMS = frozenset({"API", "VPS", "CLI", "GPU", "CPU", "SSH", "URL", "LLM", "IA", "AI"})
+
+_WORD = re.compile(r"[^\W\d_]+")
+
+
+def _cue_pattern(cue: str) -> re.Pattern[str]:
+    literal = re.escape(cue.rstrip(" "))
+    pattern = literal
+    if cue[:1].isalnum():
+        # Same as a leading \b, but after the literal so re can still
+        # search for the literal itself, which is ~10x faster.
+        pattern += rf"(?<!\w{literal})"
+    if cue.endswith(" "):
+        pattern += r"\b"
+    return re.compile(pattern)
+
+
+_CUE_PATTERNS = tuple(tuple(map(_cue_pattern, cues)) for cues in PILLAR_CUES)
+
+# Indexed by min(caps words, 4): none is flat, one or two is punchy, more is shouting.
+_CAPS_CURVE = np.array([0.0, 1.0, 1.0, 0.6, 0.3])
+
+
+class TitleFeatures:
+    """Feature arrays for a batch of ``n`` titles.
+
+    ``length`` (n,) rendered widths in cells (see :mod:`clickbait.titlelen`);
+    ``emoji`` (n,) index of the pillar emoji the title starts with, ``-1``
+    for any other emoji and ``-2`` for none; ``caps`` (n,) ALL-CAPS power
+    word counts; ``cues`` (n, 5) cue hits per pillar.
+    """
+
+    __slots__ = ("titles", "length", "emoji", "caps", "cues")
+
+    def __init__(
+        self,
+        titles: Sequence[str],
+        length: np.ndarray,
+        emoji: np.ndarray,
+        caps: np.ndarray,
+        cues: np.ndarray,
+    ) -> None:
+        self.titles = titles
+        self.length = length
+        self.emoji = emoji
+        self.caps = caps
+        self.cues = cues
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+
+class ScoreBatch:
+    """Scores for a batch of titles.
+
+    ``pillars`` is an (n, 5) array in :data:`~clickbait.card.PILLARS`
+    order and ``overall`` the (n,) best-pillar score of each title.
+    """
+
+    __slots__ = ("titles", "pillars", "overall")
+
+    def __init__(self, titles: Sequence[str], pillars: np.ndarray, overall: np.ndarray) -> None:
+        self.titles = titles
+        self.pillars = pillars
+        self.overall = overall
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def best_pillar(self) -> np.ndarray:
+        """Index of the highest-scoring pillar for each title."""
+        return self.pillars.argmax(axis=1)
+
+    def top(self, k: int, pillar: int | str | None = None) -> list[tuple[str, float]]:
+        """The ``k`` best titles overall, or for one pillar (by index or name)."""
+        if isinstance(pillar, str):
+            pillar = PILLARS.index(pillar)
+        scores = self.overall if pillar is None else self.pillars[:, pillar]
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        picked = np.argpartition(-scores, k - 1)[:k]
+        picked = picked[np.argsort(-scores[picked], kind="stable")]
+        return [(self.titles[i], float(scores[i])) for i in picked]
+
+    def pick_per_pillar(self) -> list[tuple[str, float]]:
+        """The best title for each of the five pillars, in pillar order; ``[]`` if empty."""
+        if not len(self.titles):
+            return []
+        rows = self.pillars.argmax(axis=0)
+        return [(self.titles[i], float(self.pillars[i, p])) for p, i in enumerate(rows)]
+
+
+def _emoji_class(title: str) -> int:
+    head = title[:1]
+    if not head:
+        return -2
+    try:
+        return PILLAR_EMOJI.index(head)
+    except ValueError:
+        pass
+    return -1 if ord(head) >= 0x2190 and not head.isalnum() else -2
+
+
+def _caps_words(title: str) -> int:
+    return sum(
+        1 for word in _WORD.findall(title) if len(word) >= 3 and word.isupper() and word not in ACRONYMS
+    )
+
+
+def extract_features(titles: Sequence[str]) -> TitleFeatures:
+    """Compute the feature arrays for ``titles``."""
+    titles = list(titles)
+    length = measure_many(titles)[1].astype(np.int32)
+    emoji = np.fromiter((_emoji_class(t) for t in titles), dtype=np.int8, count=len(titles))
+    caps = np.fromiter((_caps_words(t) for t in titles), dtype=np.int16, count=len(titles))
+    cues = np.zeros((len(titles), len(PILLARS)), dtype=np.int16)
+    # All titles folded into one string, one per line, so each cue is a
+    # single regex scan; a hit's offset tells which title it is in.
+    text = "\n".join(fold(t).replace("\n", " ") for t in titles)
+    newlines = np.flatnonzero(np.frombuffer(text.encode("utf-32-le"), dtype="<u4") == ord("\n"))
+    for p, patterns in enumerate(_CUE_PATTERNS):
+        for pattern in patterns:
+            hits = np.fromiter((m.start() for m in pattern.finditer(text)), dtype=np.int64)
+            cues[np.unique(np.searchsorted(newlines, hits)), p] += 1
+    return TitleFeatures(titles, length, emoji, caps, cues)
+
+
+class TitleScorer:
+    """Vectorized scorer for candidate titles.
+
+    ``sweet_spot`` is the inclusive width range (in cells) that earns the full
+    length score; ``spread`` controls how fast it decays outside it, and
+    titles longer than ``max_length`` score zero for length.  ``weights``
+    splits the shared base score between length, emoji and caps; ``cue_weight``
+    is the share of each pillar score that comes from that pillar's cues.
+    """
+
+    def __init__(
+        self,
+        sweet_spot: tuple[int, int] = (38, 43),
+        spread: float = 8.0,
+        max_length: int = 100,
+        weights: tuple[float, float, float] = (0.5, 0.2, 0.3),
+        cue_weight: float = 0.4,
+    ) -> None:
+        if not 0.0 <= cue_weight <= 1.0:
+            raise ValueError("cue_weight must be between 0 and 1")
+        total = sum(weights)
+        if total <= 0:
+            raise ValueError("weights must not all be zero")
+        self.sweet_spot = sweet_spot
+        self.spread = spread
+        self.max_length = max_length
+        self.weights = tuple(w / total for w in weights)
+        self.cue_weight = cue_weight
+
+    def length_score(self, length: np.ndarray) -> np.ndarray:
+        low, high = self.sweet_spot
+        distance = np.maximum(np.maximum(low - length, length - high), 0)
+        score = np.exp(-((distance / self.spread) ** 2))
+        return np.where(length > self.max_length, 0.0, score)
+
+    def score_features(self, features: TitleFeatures) -> ScoreBatch:
+        """Score precomputed features."""
+        w_len, w_emoji, w_caps = self.weights
+        base = (
+            w_len * self.length_score(features.length)
+            + w_emoji * (features.emoji > -2)
+            + w_caps * _CAPS_CURVE[np.minimum(features.caps, 4)]
+        )
+        # Three cues saturate a pillar; its own emoji counts as one more.
+        own_emoji = features.emoji[:, None] == np.arange(len(PILLARS))[None, :]
+        cue = np.minimum(features.cues + own_emoji, 3) / 3.0
+        pillars = 10.0 * ((1.0 - self.cue_weight) * base[:, None] + self.cue_weight * cue)
+        return ScoreBatch(features.titles, pillars, pillars.max(axis=1))
+
+    def score(self, titles: Sequence[str]) -> ScoreBatch:
+        """Extract features for ``titles`` and score them."""
+        with profiling.stage("score", len(titles)):
+            return self.score_features(extract_features(titles))
+
+
+def score_titles(titles: Sequence[str]) -> ScoreBatch:
+    """Score ``titles`` with the default :class:`TitleScorer`."""
+    return TitleScorer().score(titles)
@@ -0,0 +1,104 @@
+"""Deterministic synthetic idea cards for benchmarks.
+
+The cards look like the real ones (five pillar titles with emoji and
+ALL-CAPS words, twelve tags, three hashtags, a hook) and are fully
+determined by ``seed``, so two benchmark runs see the same corpus.  Each
+card gets a unique relative ``path`` under ``synthetic/``.
+About one card in twenty is a light rewrite of an earlier one, so the
+dedup stage has real work to do.
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Iterator
+
+from .card import PILLARS, STRATEGIES, Card, Title
+from .text import slugify
+from .titlelen import measure
+
+__all__ = ["synthetic_cards"]
+
+_PRODUCTS = (
+    "OpenClaw", "Clawdbot", "Claude Code", "Cursor", "Copilot", "Ollama", "n8n", "LangChain",
+    "Gemini CLI", "Aider", "Devin", "Windsurf", "Supabase", "Docker", "Kubernetes", "Linux",
+)
+_ANGLES = (
+    "custo real", "instalação", "segurança", "VPS", "memória", "agentes", "automação", "tokens",
+    "configuração", "erros comuns", "casos de uso", "produtividade", "alternativas", "iniciantes",
+    "servidor próprio", "API", "privacidade", "atalhos", "integrações", "limites",
+)
+_CAPS = (
+    "REALMENTE", "NINGUÉM", "CUIDADO", "GRÁTIS", "SEGREDO", "DEVOROU", "TUDO", "ERRO", "AGORA",
+    "DESTRUIR", "MELHOR", "VERDADE", "INSANO", "SEGURO",
+)
+_TEMPLATES = (
+    ("🔍", "{p}: quanto {c} custa {a}?"),
+    ("⚠️", "{p} pode {c} seu projeto ({a})"),
+    ("🚀", "{p} {c}: o truque de {a} que uso"),
+    ("🤯", "{p}: o {c} de {a} que ninguém mostra"),
+    ("🔥", "Devs já usam {p} pra {a} - e você?"),
+)
+_TAG_WORDS = (
+    "tutorial", "review", "como usar", "preço", "grátis", "passo a passo", "guia", "dicas",
+    "erros", "2026", "iniciante", "avançado", "vale a pena", "configurar", "instalar", "segurança",
+)
+
+
+def _path(number: int, headline: str) -> str:
+    return f"synthetic/{number:06d}-{slugify(headline, 40)}.md"
+
+
+def _card(rng: random.Random, number: int) -> Card:
+    product = rng.choice(_PRODUCTS)
+    angle = rng.choice(_ANGLES)
+    titles = []
+    for i, (pillar, (emoji, template)) in enumerate(zip(PILLARS, _TEMPLATES)):
+        text = f"{emoji} " + template.format(p=product, c=rng.choice(_CAPS), a=angle)
+        titles.append(Title(i + 1, pillar, text, measure(text).chars))
+    base = product.lower()
+    tags = [base, f"{base} {angle.lower()}"]
+    tags += [f"{base} {word}" for word in rng.sample(_TAG_WORDS, 7)]
+    tags += [f"{angle.lower()} {word}" for word in rng.sample(_TAG_WORDS, 3)]
+    hashtag = "".join(part.capitalize() for part in angle.split())
+    headline = f"{product}: {angle} sem enrolação"
+    return Card(
+        headline=headline,
+        score=round(rng.uniform(7.5, 9.2), 1),
+        date=f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        strategy=rng.choice(STRATEGIES),
+        titles=tuple(titles),
+        tags=tuple(tags),
+        hashtags=(f"#{product.replace(' ', '')}", f"#{hashtag}", "#IA"),
+        hook=(
+            f"Você já usa {product} pra {angle}? Eu testei por {rng.randint(2, 30)} dias e "
+            f"descobri algo que {rng.choice(('ninguém', 'pouca gente', 'quase ninguém'))} fala. "
+            f"Nesse vídeo eu vou te mostrar {rng.choice(('TUDO', 'o passo a passo', 'o truque'))}."
+        ),
+        path=_path(number, headline),
+    )
+
+
+def synthetic_cards(n: int, seed: int = 0) -> Iterator[Card]:
+    """Yield ``n`` reproducible synthetic cards."""
+    rng = random.Random(seed)
+    recent: list[Card] = []
+    for number in range(n):
+        if recent and rng.random() < 0.05:
+            original = rng.choice(recent)
+            card = Card(
+                headline=original.headline + " (parte 2)",
+                score=original.score,
+                date=original.date,
+                strategy=original.strategy,
+                titles=original.titles,
+                tags=original.tags[:-1],
+                hashtags=original.hashtags,
+                hook=original.hook,
+                path=_path(number, original.headline + " parte 2"),
+            )
+        else:
+            card = _card(rng, number)
+        recent.append(card)
+        del recent[:-100]
+        yield card
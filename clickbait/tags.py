@@ -0,0 +1,252 @@
+"""Inverted index over card tags and hashtags, with ranked suggestions.
+
+Tags are free text (``"clawdbot preço"``, ``"openclaw seguro"``), so they
+are keyed by their folded terms: ``"Segurança VPS"`` and
+``"seguranca vps"`` are the same tag.  :class:`TagIndex` maps each tag to
+the cards that use it, weights it by the sum of those cards' scores,
+counts which tags appear together, and keeps a word trie so a partial
+topic (``"openclaw seg"``) already finds ``"openclaw segurança"``.
+
+The index is updated card by card (:meth:`TagIndex.add` /
+:meth:`TagIndex.remove`) and keeps per-word rankings cached between
+updates, so :meth:`TagIndex.suggest` can run inside the generation loop.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import Counter
+from collections.abc import Container, Hashable, Iterable
+
+from .card import Card
+from .text import terms
+
+__all__ = ["TagIndex", "normalize_tag"]
+
+# How many tags per word are kept ranked for suggestions, and how many
+# trie words a partial last word may expand to.
+_TOP_PER_WORD = 64
+_MAX_EXPANSIONS = 16
+
+
+def normalize_tag(tag: str) -> str:
+    """Index key for ``tag``: folded terms joined by single spaces, no ``#``."""
+    return " ".join(terms(tag))
+
+
+def _unique(key: Hashable, taken: Container[Hashable]) -> Hashable:
+    if key not in taken:
+        return key
+    n = 2
+    while f"{key}#{n}" in taken:
+        n += 1
+    return f"{key}#{n}"
+
+
+class _TrieNode:
+    __slots__ = ("children", "word")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.word: str | None = None
+
+
+class TagIndex:
+    """Tag -> cards index for one card field (``"tags"`` or ``"hashtags"``).
+
+    ::
+
+        index = TagIndex.from_cards(iter_cards("outputs/Lista de ideias"))
+        index.suggest("openclaw custo", n=5)
+        # ['openclaw custo', 'openclaw', 'openclaw review', ...]
+    """
+
+    def __init__(self, field: str = "tags") -> None:
+        if field not in ("tags", "hashtags"):
+            raise ValueError(f"field must be 'tags' or 'hashtags', not {field!r}")
+        self.field = field
+        self._cards: dict[str, set[Hashable]] = {}
+        self._weight: dict[str, float] = {}
+        self._display: dict[str, str] = {}
+        self._cooccur: dict[str, Counter[str]] = {}
+        self._by_word: dict[str, set[str]] = {}
+        self._indexed: dict[Hashable, tuple[float, tuple[str, ...]]] = {}
+        self._trie = _TrieNode()
+        self._ranked: dict[str, list[str]] = {}
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[Card], field: str = "tags") -> TagIndex:
+        index = cls(field)
+        for card in cards:
+            index.add(card)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __contains__(self, tag: object) -> bool:
+        return isinstance(tag, str) and normalize_tag(tag) in self._cards
+
+    @staticmethod
+    def key_of(card: Card) -> Hashable:
+        """The card's file path, or its headline for cards not read from disk."""
+        return card.path or card.headline
+
+    # -- updating -------------------------------------------------------
+
+    def add(self, card: Card, key: Hashable | None = None) -> None:
+        """Index ``card``'s tags under ``key``, :meth:`key_of` by default.
+
+        Re-adding a known ``key`` replaces its old tags.  Without a
+        ``key``, a card whose path or headline is already indexed gets a
+        unique key (``"headline#2"``) instead.
+        """
+        if key is None:
+            key = _unique(self.key_of(card), self._indexed)
+        elif key in self._indexed:
+            self.remove(key)
+        raw = card.tags if self.field == "tags" else card.hashtags
+        tags: dict[str, str] = {}
+        for tag in raw:
+            norm = normalize_tag(tag)
+            if norm:
+                tags.setdefault(norm, tag.strip())
+        self._indexed[key] = (card.score, tuple(tags))
+
+        for norm, display in tags.items():
+            if norm not in self._cards:
+                self._cards[norm] = set()
+                self._weight[norm] = 0.0
+                self._display[norm] = display
+                self._cooccur[norm] = Counter()
+                for word in norm.split():
+                    if word not in self._by_word:
+                        self._by_word[word] = set()
+                        self._insert_word(word)
+                    self._by_word[word].add(norm)
+            self._cards[norm].add(key)
+            self._weight[norm] += card.score
+            self._cooccur[norm].update(other for other in tags if other != norm)
+            self._promote(norm)
+
+    def remove(self, key: Hashable) -> None:
+        """Forget the card indexed under ``key``."""
+        score, tags = self._indexed.pop(key)
+        for norm in tags:
+            self._cards[norm].discard(key)
+            self._weight[norm] -= score
+            cooccur = self._cooccur[norm]
+            cooccur.subtract(other for other in tags if other != norm)
+            for other in [o for o in tags if o != norm and cooccur[o] <= 0]:
+                del cooccur[other]
+            self._invalidate(norm)
+            if not self._cards[norm]:
+                for word in norm.split():
+                    self._by_word[word].discard(norm)
+                del self._cards[norm], self._weight[norm], self._display[norm], self._cooccur[norm]
+
+    def _insert_word(self, word: str) -> None:
+        node = self._trie
+        for ch in word:
+            node = node.children.setdefault(ch, _TrieNode())
+        node.word = word
+
+    def _promote(self, norm: str) -> None:
+        # Adding only raises weights, so a cached top list stays valid once
+        # ``norm`` is moved to its new position (or left out if too light).
+        weight = self._weight[norm]
+        for word in norm.split():
+            ranked = self._ranked.get(word)
+            if ranked is None:
+                continue
+            if norm in ranked:
+                ranked.remove(norm)
+            elif len(ranked) >= _TOP_PER_WORD and weight <= self._weight[ranked[-1]]:
+                continue
+            pos = 0
+            while pos < len(ranked) and self._weight[ranked[pos]] >= weight:
+                pos += 1
+            ranked.insert(pos, norm)
+            del ranked[_TOP_PER_WORD:]
+
+    def _invalidate(self, norm: str) -> None:
+        for word in norm.split():
+            self._ranked.pop(word, None)
+
+    # -- querying -------------------------------------------------------
+
+    def cards(self, tag: str) -> set[Hashable]:
+        """Keys of the cards using ``tag``."""
+        return set(self._cards.get(normalize_tag(tag), ()))
+
+    def weight(self, tag: str) -> float:
+        """Sum of the scores of the cards using ``tag``."""
+        return self._weight.get(normalize_tag(tag), 0.0)
+
+    def related(self, tag: str, n: int = 10) -> list[tuple[str, int]]:
+        """Tags that most often appear on the same cards as ``tag``."""
+        cooccur = self._cooccur.get(normalize_tag(tag))
+        if not cooccur:
+            return []
+        return [(self._display[other], count) for other, count in cooccur.most_common(n)]
+
+    def complete(self, prefix: str, limit: int = _MAX_EXPANSIONS) -> list[str]:
+        """Indexed words starting with ``prefix`` (folded), shortest first."""
+        node = self._trie
+        for ch in normalize_tag(prefix):
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        words: list[str] = []
+        level = [node]
+        while level and len(words) < limit:
+            next_level = []
+            for current in level:
+                if current.word is not None and self._by_word.get(current.word):
+                    words.append(current.word)
+                next_level.extend(current.children.values())
+            level = next_level
+        return words[:limit]
+
+    def _top(self, word: str) -> list[str]:
+        ranked = self._ranked.get(word)
+        if ranked is None:
+            ranked = heapq.nlargest(_TOP_PER_WORD, self._by_word.get(word, ()), key=self._weight.__getitem__)
+            self._ranked[word] = ranked
+        return ranked
+
+    def suggest(self, topic: str, n: int = 10, exclude: Iterable[str] = ()) -> list[str]:
+        """The ``n`` best tags for ``topic``.
+
+        Tags are ranked by how many of the topic's words they share
+        (the last word also matches as a prefix), then by weight; the
+        tags most often used alongside the best matches fill in after
+        them.  Returns tags as they were first written.
+        """
+        words = terms(topic)
+        if not words:
+            return []
+        skip = {normalize_tag(tag) for tag in exclude}
+
+        hits: Counter[str] = Counter()
+        for word in dict.fromkeys(words[:-1]):
+            hits.update(self._top(word))
+        last = words[-1]
+        expansions = self.complete(last) if last not in self._by_word else [last]
+        prefixed: set[str] = set()
+        for word in expansions:
+            prefixed.update(self._top(word))
+        hits.update(prefixed)
+
+        weight = self._weight
+        scored = {tag: (count, weight[tag]) for tag, count in hits.items() if tag not in skip}
+        best = heapq.nlargest(n, scored, key=scored.__getitem__)
+
+        if len(best) < n:
+            neighbours: Counter[str] = Counter()
+            for tag in best[:3]:
+                for other, count in self._cooccur[tag].most_common(n):
+                    if other not in scored and other not in skip:
+                        neighbours[other] += count * weight[other]
+            best.extend(tag for tag, _ in neighbours.most_common(n - len(best)))
+        return [self._display[tag] for tag in best]
@@ -0,0 +1,40 @@
+"""Text normalization shared by the parser, indexes and scorers.
+
+Cards are written in Portuguese and freely mix accents, emoji and
+ALL-CAPS emphasis, so every lookup key goes through :func:`fold` first:
+``"Segurança"``, ``"SEGURANCA"`` and ``"seguranca"`` all become the same
+term.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+
+__all__ = ["fold", "slugify", "terms"]
+
+_TERM = re.compile(r"[0-9a-z]+")
+
+
+@lru_cache(maxsize=65536)
+def fold(text: str) -> str:
+    """Lowercase ``text`` and strip diacritics (``"Ação"`` -> ``"acao"``)."""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return stripped.casefold()
+
+
+def terms(text: str) -> list[str]:
+    """Split ``text`` into folded alphanumeric terms, dropping emoji and punctuation."""
+    return _TERM.findall(fold(text))
+
+
+def slugify(text: str, max_length: int = 60) -> str:
+    """File-name slug for ``text``: ``"OpenClaw: O Devorador"`` -> ``"openclaw-o-devorador"``."""
+    slug = "-".join(terms(text))
+    if len(slug) > max_length:
+        slug = slug[:max_length].rsplit("-", 1)[0] or slug[:max_length]
+    return slug or "card"
@@ -0,0 +1,472 @@
+"""Title length as YouTube and phones see it.
+
+``len(title)`` counts code points, so ``"⚠️"`` (U+26A0 U+FE0F) is 2 and
+``"👍🏽"`` is 2, while a viewer sees one character each; emoji also take
+two cells on screen.  This module splits titles into grapheme clusters
+(a practical subset of UAX #29: combining marks, variation selectors,
+skin tone modifiers, ZWJ sequences, flags and keycaps) and measures both
+the cluster count (what the ``Chars`` column shows and the 100-character
+limit applies to) and the rendered width (what the mobile truncation
+point applies to).
+
+Per-code-point properties come from a table built once from
+:mod:`unicodedata` on first use.  A title's code points are looked up in
+that table all at once with NumPy; only titles with ZWJ sequences, flags
+or CR are walked code point by code point.  :func:`measure` is also
+LRU-cached, and :func:`measure_many` measures a whole batch in one
+vectorised pass.
+
+Requires NumPy.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
+
+import numpy as np
+
+from .card import Card, Title
+
+__all__ = [
+    "MOBILE_TRUNCATION",
+    "TITLE_LIMIT",
+    "TitleLength",
+    "ValidationReport",
+    "graphemes",
+    "measure",
+    "measure_many",
+    "recount_chars",
+    "validate",
+]
+
+#: YouTube rejects titles longer than this many characters.
+TITLE_LIMIT = 100
+
+#: Roughly how many cells a phone shows before cutting the title with "…".
+MOBILE_TRUNCATION = 45
+
+# Property bits, one byte per code point.
+_EXTEND = 0x01  # combining mark, variation selector, tag, skin tone modifier
+_ZWJ = 0x02
+_RI = 0x04  # regional indicator (flags)
+_PICT = 0x08  # extended pictographic (emoji base)
+_WIDE = 0x10  # two cells on its own (East Asian Wide/Fullwidth, emoji presentation)
+_ZERO = 0x20  # no cells on its own (controls, format characters)
+_MOD = 0x40  # emoji skin tone modifier
+_VS16 = 0x80  # emoji presentation selector
+
+_TABLE_SIZE = 0x110000
+_BMP_SMP = 0x20000  # planes 0 and 1 take their properties from unicodedata
+
+# Ranges of extended pictographic code points (emoji bases).
+_PICT_RANGES = (
+    (0x00A9, 0x00A9),
+    (0x00AE, 0x00AE),
+    (0x203C, 0x203C),
+    (0x2049, 0x2049),
+    (0x2122, 0x2122),
+    (0x2139, 0x2139),
+    (0x2194, 0x21AA),
+    (0x231A, 0x23FF),
+    (0x24C2, 0x24C2),
+    (0x25AA, 0x25FE),
+    (0x2600, 0x27BF),
+    (0x2934, 0x2935),
+    (0x2B05, 0x2B55),
+    (0x3030, 0x3030),
+    (0x303D, 0x303D),
+    (0x3297, 0x3299),
+    (0x1F000, 0x1F0FF),
+    (0x1F10D, 0x1F10F),
+    (0x1F12F, 0x1F12F),
+    (0x1F16C, 0x1F171),
+    (0x1F17E, 0x1F17F),
+    (0x1F18E, 0x1F18E),
+    (0x1F191, 0x1F19A),
+    (0x1F1AD, 0x1F1E5),
+    (0x1F201, 0x1F2FF),
+    (0x1F300, 0x1F3FA),
+    (0x1F400, 0x1F53D),
+    (0x1F546, 0x1F64F),
+    (0x1F680, 0x1F6FF),
+    (0x1F774, 0x1F77F),
+    (0x1F7D5, 0x1F7FF),
+    (0x1F80C, 0x1F80F),
+    (0x1F848, 0x1F84F),
+    (0x1F85A, 0x1F85F),
+    (0x1F888, 0x1F88F),
+    (0x1F8AE, 0x1F8FF),
+    (0x1F90C, 0x1F93A),
+    (0x1F93C, 0x1F945),
+    (0x1F947, 0x1FAFF),
+    (0x1FC00, 0x1FFFD),
+)
+
+# Pictographs that default to emoji (two-cell) presentation without U+FE0F.
+_EMOJI_PRESENTATION_RANGES = (
+    (0x231A, 0x231B),
+    (0x23E9, 0x23EC),
+    (0x23F0, 0x23F0),
+    (0x23F3, 0x23F3),
+    (0x25FD, 0x25FE),
+    (0x2614, 0x2615),
+    (0x2648, 0x2653),
+    (0x267F, 0x267F),
+    (0x2693, 0x2693),
+    (0x26A1, 0x26A1),
+    (0x26AA, 0x26AB),
+    (0x26BD, 0x26BE),
+    (0x26C4, 0x26C5),
+    (0x26CE, 0x26CE),
+    (0x26D4, 0x26D4),
+    (0x26EA, 0x26EA),
+    (0x26F2, 0x26F3),
+    (0x26F5, 0x26F5),
+    (0x26FA, 0x26FA),
+    (0x26FD, 0x26FD),
+    (0x2705, 0x2705),
+    (0x270A, 0x270B),
+    (0x2728, 0x2728),
+    (0x274C, 0x274C),
+    (0x274E, 0x274E),
+    (0x2753, 0x2755),
+    (0x2757, 0x2757),
+    (0x2795, 0x2797),
+    (0x27B0, 0x27B0),
+    (0x27BF, 0x27BF),
+    (0x2B1B, 0x2B1C),
+    (0x2B50, 0x2B50),
+    (0x2B55, 0x2B55),
+    (0x1F004, 0x1F004),
+    (0x1F0CF, 0x1F0CF),
+    (0x1F18E, 0x1F18E),
+    (0x1F191, 0x1F19A),
+    (0x1F300, 0x1F320),
+    (0x1F32D, 0x1F335),
+    (0x1F337, 0x1F37C),
+    (0x1F37E, 0x1F393),
+    (0x1F3A0, 0x1F3CA),
+    (0x1F3CF, 0x1F3D3),
+    (0x1F3E0, 0x1F3F0),
+    (0x1F3F4, 0x1F3F4),
+    (0x1F3F8, 0x1F43E),
+    (0x1F440, 0x1F440),
+    (0x1F442, 0x1F4FC),
+    (0x1F4FF, 0x1F53D),
+    (0x1F54B, 0x1F54E),
+    (0x1F550, 0x1F567),
+    (0x1F57A, 0x1F57A),
+    (0x1F595, 0x1F596),
+    (0x1F5A4, 0x1F5A4),
+    (0x1F5FB, 0x1F64F),
+    (0x1F680, 0x1F6C5),
+    (0x1F6CC, 0x1F6CC),
+    (0x1F6D0, 0x1F6D2),
+    (0x1F6D5, 0x1F6D7),
+    (0x1F6DC, 0x1F6DF),
+    (0x1F6EB, 0x1F6EC),
+    (0x1F6F4, 0x1F6FC),
+    (0x1F7E0, 0x1F7EB),
+    (0x1F7F0, 0x1F7F0),
+    (0x1F90C, 0x1F93A),
+    (0x1F93C, 0x1F945),
+    (0x1F947, 0x1F9FF),
+    (0x1FA70, 0x1FAFF),
+)
+
+_table: bytearray | None = None
+_flags: np.ndarray | None = None
+
+_JOINERS = _ZWJ | _RI  # need the full rules of :func:`_walk`
+_KEYCAP = 0x20E3
+
+
+def _flag_class(mask: int) -> re.Pattern[bytes]:
+    """Match a property byte that has any bit of ``mask`` set."""
+    return re.compile(b"[" + b"".join(re.escape(bytes([v])) for v in range(256) if v & mask) + b"]")
+
+
+_JOINER_RE = _flag_class(_JOINERS)
+_MARK_RE = _flag_class(_EXTEND)
+# Width of a code point standing on its own, indexed by its property byte.
+_CELLS = bytes(2 if v & _WIDE else 0 if v & (_ZERO | _EXTEND) else 1 for v in range(256))
+_CELL_ARRAY = np.frombuffer(_CELLS, dtype=np.uint8)
+
+
+def _build_table() -> bytearray:
+    table = bytearray(_TABLE_SIZE)
+    category = unicodedata.category
+    east_asian_width = unicodedata.east_asian_width
+    for cp in range(_BMP_SMP):
+        ch = chr(cp)
+        cat = category(ch)
+        flags = 0
+        if cat in ("Mn", "Me", "Mc"):
+            flags |= _EXTEND
+        elif cat in ("Cc", "Cf", "Zl", "Zp", "Cs"):
+            flags |= _ZERO
+        if east_asian_width(ch) in ("W", "F"):
+            flags |= _WIDE
+        table[cp] = flags
+    for low, high in _PICT_RANGES:
+        for cp in range(low, high + 1):
+            table[cp] |= _PICT
+    for low, high in _EMOJI_PRESENTATION_RANGES:
+        for cp in range(low, high + 1):
+            table[cp] |= _WIDE
+    for cp in range(0xFE00, 0xFE10):
+        table[cp] = _EXTEND | _ZERO
+    table[0xFE0F] |= _VS16
+    table[0x200D] = _ZWJ | _ZERO
+    for cp in range(0x1F1E6, 0x1F200):
+        table[cp] = _RI | _WIDE
+    for cp in range(0x1F3FB, 0x1F400):
+        table[cp] = _EXTEND | _MOD | _WIDE
+    table[0x20000:0x3FFFE] = bytes([_WIDE]) * (0x3FFFE - 0x20000)  # CJK extension planes
+    table[0xE0000:0xE1000] = bytes([_EXTEND | _ZERO]) * 0x1000  # tags, variation selectors
+    return table
+
+
+def _lookup() -> bytearray:
+    global _table, _flags
+    if _table is None:
+        _table = _build_table()
+        _flags = np.frombuffer(_table, dtype=np.uint8)
+    return _table
+
+
+def _props(cp: int) -> int:
+    return (_table or _lookup())[cp]
+
+
+def _props_of(text: str) -> bytes:
+    """Property byte of every code point in ``text``, looked up in one go."""
+    _lookup()
+    return _flags[np.frombuffer(text.encode("utf-32-le"), dtype="<u4")].tobytes()
+
+
+def _marks(text: str, props: bytes) -> list[int] | None:
+    """Positions of the marks that join the code point before them.
+
+    Without ZWJ, regional indicators or CR that is the only joining rule
+    left; ``None`` means ``text`` has one of those and must be walked.
+    """
+    if _JOINER_RE.search(props) or "\r" in text:
+        return None
+    if not _MARK_RE.search(props, 1):
+        return []
+    return [m.start() for m in _MARK_RE.finditer(props, 1)]
+
+
+def _cluster_width(cluster: str) -> int:
+    first = _props(ord(cluster[0]))
+    if len(cluster) == 1:
+        if first & _WIDE:
+            return 2
+        return 0 if first & (_ZERO | _EXTEND) else 1
+    if first & _RI:
+        return 2
+    for ch in cluster[1:]:
+        props = _props(ord(ch))
+        if props & (_VS16 | _MOD | _ZWJ) or ch == "\u20e3":
+            return 2
+    if first & _WIDE:
+        return 2
+    return 0 if first & (_ZERO | _EXTEND) else 1
+
+
+def _walk(text: str) -> list[str]:
+    """Split ``text`` code point by code point, applying every joining rule."""
+    clusters: list[str] = []
+    start = 0
+    prev = -1
+    pict = False  # current cluster started with a pictograph (ZWJ sequences join)
+    ri_run = 0
+    for i, ch in enumerate(text):
+        props = _props(ord(ch))
+        if i == 0:
+            pict = bool(props & _PICT)
+            ri_run = 1 if props & _RI else 0
+            prev = props
+            continue
+        join = False
+        if text[i - 1] == "\r" and ch == "\n":
+            join = True
+        elif props & (_EXTEND | _ZWJ):
+            join = True
+        elif prev & _ZWJ and pict and props & _PICT:
+            join = True
+        elif props & _RI and prev & _RI and ri_run % 2 == 1:
+            join = True
+        if not join:
+            clusters.append(text[start:i])
+            start = i
+            pict = bool(props & _PICT)
+            ri_run = 0
+        if props & _RI:
+            ri_run += 1
+        prev = props
+    if start < len(text):
+        clusters.append(text[start:])
+    return clusters
+
+
+def graphemes(text: str) -> list[str]:
+    """Split ``text`` into user-perceived characters."""
+    marks = _marks(text, _props_of(text))
+    if marks is None:
+        return _walk(text)
+    clusters = list(text)
+    for i in reversed(marks):
+        clusters[i - 1] += clusters.pop(i)
+    return clusters
+
+
+class TitleLength:
+    """Measurements of one title.
+
+    ``chars`` is the number of grapheme clusters, ``width`` the number of
+    terminal/phone cells, ``codepoints`` plain ``len()``.
+    """
+
+    __slots__ = ("chars", "width", "codepoints")
+
+    def __init__(self, chars: int, width: int, codepoints: int) -> None:
+        self.chars = chars
+        self.width = width
+        self.codepoints = codepoints
+
+    def __repr__(self) -> str:
+        return f"TitleLength(chars={self.chars}, width={self.width}, codepoints={self.codepoints})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TitleLength):
+            return NotImplemented
+        return (self.chars, self.width, self.codepoints) == (other.chars, other.width, other.codepoints)
+
+
+@lru_cache(maxsize=65536)
+def measure(title: str) -> TitleLength:
+    """Measure ``title``; results are cached."""
+    if title.isascii() and title.isprintable():
+        return TitleLength(len(title), len(title), len(title))
+    props = _props_of(title)
+    marks = _marks(title, props)
+    if marks is None:
+        clusters = _walk(title)
+        return TitleLength(len(clusters), sum(map(_cluster_width, clusters)), len(title))
+    width = sum(props.translate(_CELLS))
+    head = -1
+    for i in marks:
+        width -= _CELLS[props[i]]
+        if props[i] & (_VS16 | _MOD) or ord(title[i]) == _KEYCAP:
+            j = i - 1
+            while j and props[j] & _EXTEND:
+                j -= 1
+            if j != head:  # the cluster starting at j is an emoji
+                width += 2 - _CELLS[props[j]]
+                head = j
+    return TitleLength(len(title) - len(marks), width, len(title))
+
+
+def measure_many(titles: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Cluster counts and widths of every title, as two ``int64`` arrays.
+
+    The titles' code points are looked up and split in one vectorised
+    pass; only titles with ZWJ sequences, flags or CR go through
+    :func:`measure`.
+    """
+    titles = list(titles)
+    n = len(titles)
+    lengths = np.fromiter(map(len, titles), dtype=np.int64, count=n)
+    chars, width = lengths.copy(), np.zeros(n, dtype=np.int64)
+    text = "".join(titles)
+    if not text:
+        return chars, width
+    _lookup()
+    cps = np.frombuffer(text.encode("utf-32-le"), dtype="<u4")
+    props = _flags[cps]
+    ends = np.cumsum(lengths)
+    firsts = (ends - lengths)[lengths > 0]  # every title starts a cluster
+
+    marks = np.flatnonzero(props & _EXTEND)
+    marks = marks[~np.isin(marks, firsts)]
+    cells = _CELL_ARRAY[props]
+    cells[marks] = 0
+    width[lengths > 0] = np.add.reduceat(cells, firsts, dtype=np.int64)
+    chars -= np.bincount(np.searchsorted(ends, marks, side="right"), minlength=n)
+
+    emoji = marks[((props[marks] & (_VS16 | _MOD)) != 0) | (cps[marks] == _KEYCAP)]
+    if len(emoji):
+        joined = np.zeros(len(cps), dtype=bool)
+        joined[marks] = True
+        heads = emoji - 1
+        while (back := joined[heads]).any():
+            heads[back] -= 1
+        heads = np.unique(heads)
+        width += np.bincount(np.searchsorted(ends, heads, side="right"), weights=2 - cells[heads], minlength=n).astype(np.int64)
+
+    walk = np.flatnonzero(props & _JOINERS)
+    if "\r" in text:
+        walk = np.concatenate([walk, np.flatnonzero(cps == ord("\r"))])
+    for i in np.unique(np.searchsorted(ends, walk, side="right")).tolist():
+        m = measure(titles[i])
+        chars[i], width[i] = m.chars, m.width
+    return chars, width
+
+
+class ValidationReport:
+    """Result of :func:`validate` over a batch of titles.
+
+    ``lengths`` holds one :class:`TitleLength` per title; ``too_long`` and
+    ``truncated`` are the indices over the hard limit and past the mobile
+    truncation point respectively.
+    """
+
+    __slots__ = ("titles", "lengths", "too_long", "truncated", "limit", "mobile")
+
+    def __init__(self, titles: Sequence[str], lengths: list[TitleLength], limit: int, mobile: int) -> None:
+        self.titles = titles
+        self.lengths = lengths
+        self.limit = limit
+        self.mobile = mobile
+        self.too_long = [i for i, m in enumerate(lengths) if m.chars > limit]
+        self.truncated = [i for i, m in enumerate(lengths) if m.width > mobile]
+
+    @property
+    def ok(self) -> bool:
+        """True when no title exceeds the hard limit."""
+        return not self.too_long
+
+    def __repr__(self) -> str:
+        return (
+            f"ValidationReport(titles={len(self.titles)}, too_long={len(self.too_long)}, "
+            f"truncated={len(self.truncated)})"
+        )
+
+
+def validate(titles: Iterable[str], limit: int = TITLE_LIMIT, mobile: int = MOBILE_TRUNCATION) -> ValidationReport:
+    """Measure every title and flag those over ``limit`` or ``mobile``."""
+    titles = list(titles)
+    chars, width = measure_many(titles)
+    lengths = [TitleLength(c, w, len(t)) for c, w, t in zip(chars.tolist(), width.tolist(), titles)]
+    return ValidationReport(titles, lengths, limit, mobile)
+
+
+def recount_chars(card: Card) -> Card:
+    """Return ``card`` with every title's ``Chars`` recomputed from its text."""
+    titles = tuple(Title(t.number, t.pillar, t.text, measure(t.text).chars) for t in card.titles)
+    return Card(
+        headline=card.headline,
+        score=card.score,
+        date=card.date,
+        strategy=card.strategy,
+        titles=titles,
+        tags=card.tags,
+        hashtags=card.hashtags,
+        hook=card.hook,
+        path=card.path,
+    )
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from clickbait.card import Card, Title, parse_file
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CARDS_DIR = os.path.join(ROOT, "outputs", "Lista de ideias")
+
+
+def card_paths() -> list[str]:
+    return sorted(os.path.join(CARDS_DIR, name) for name in os.listdir(CARDS_DIR) if name.endswith(".md"))
+
+
+def make_card(headline: str = "OpenClaw: O Devorador", score: float = 8.5, **fields: object) -> Card:
+    fields.setdefault("date", "2026-02-06")
+    fields.setdefault("strategy", "Browse")
+    fields.setdefault(
+        "titles",
+        (
+            Title(1, "Curiosidade", "🔍 O que ninguém conta sobre o OpenClaw", 38),
+            Title(2, "FOMO", "🔥 Todo dev já está usando isso", 31),
+        ),
+    )
+    fields.setdefault("tags", ("openclaw", "agente ia"))
+    fields.setdefault("hashtags", ("#OpenClaw", "#IA"))
+    fields.setdefault("hook", "Você instalou o OpenClaw e ele comeu seus tokens.")
+    return Card(headline, score, **fields)
+
+
+@pytest.fixture(scope="session")
+def real_cards() -> list[Card]:
+    return [parse_file(path) for path in card_paths()]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from clickbait.analytics import group_by, tag_report, where
+from clickbait.columnar import Corpus, export_cards
+from clickbait.synthetic import synthetic_cards
+
+
+@pytest.fixture(scope="module")
+def cards():
+    return list(synthetic_cards(400, seed=2))
+
+
+@pytest.fixture(scope="module")
+def corpus(cards, tmp_path_factory):
+    path = tmp_path_factory.mktemp("corpus")
+    export_cards(cards, path, format="numpy", chunk_size=100)
+    return Corpus(path)
+
+
+def test_group_by_matches_numpy(cards, corpus):
+    titles = corpus.read("titles", ["strategy", "pillar", "score", "chars"])
+    rows = group_by(titles, ["strategy", "pillar"], "chars", percentiles=(10, 50, 90, 99))
+    expected = defaultdict(list)
+    for card in cards:
+        for title in card.titles:
+            expected[card.strategy, title.pillar].append(title.chars)
+
+    assert {(r["strategy"], r["pillar"]) for r in rows} == set(expected)
+    for row in rows:
+        values = np.array(expected[row["strategy"], row["pillar"]], dtype=float)
+        assert row["count"] == len(values)
+        assert row["mean"] == pytest.approx(values.mean())
+        assert (row["min"], row["max"]) == (values.min(), values.max())
+        for q in (10, 50, 90, 99):
+            assert row[f"p{q}"] == pytest.approx(np.percentile(values, q))
+
+
+def test_group_by_month_and_totals(cards, corpus):
+    frame = corpus.read("cards", ["date", "score"])
+    months = group_by(frame, ["month"])
+    assert [row["month"] for row in months] == sorted({card.date[:7] for card in cards})
+    assert sum(row["count"] for row in months) == len(cards)
+    (total,) = group_by(frame, [])
+    assert total["mean"] == pytest.approx(np.mean([card.score for card in cards]))
+
+
+def test_group_by_ignores_nan_and_empty_frames(corpus):
+    frame = corpus.read("cards", ["strategy", "score"])
+    frame.columns["score"] = frame["score"].copy()
+    frame.columns["score"][::2] = np.nan
+    assert sum(row["count"] for row in group_by(frame, ["strategy"])) == len(frame) // 2
+    assert group_by(where(frame, {"strategy": "Shorts"}), ["strategy"]) == []
+
+
+def test_where(cards, corpus):
+    frame = corpus.read("titles", ["strategy", "number", "date"])
+    browse = where(frame, {"strategy": "Browse", "number": [1, 2]})
+    assert len(browse) == 2 * sum(card.strategy == "Browse" for card in cards)
+    day = cards[0].date
+    assert len(where(frame, {"date": day})) == 5 * sum(card.date == day for card in cards)
+    with pytest.raises(ValueError):
+        where(corpus.read("cards", ["tags"]), {"tags": "openclaw"})
+
+
+def test_tag_report(cards, corpus):
+    frame = corpus.read("cards", ["tags", "score"])
+    report = tag_report(frame, top=5, min_cards=3)
+    counts = defaultdict(list)
+    for card in cards:
+        for tag in card.tags:
+            counts[tag].append(card.score)
+    assert len(report) == 5
+    assert [row["cards"] for row in report] == sorted((len(s) for s in counts.values()), reverse=True)[:5]
+    for row in report:
+        assert row["cards"] == len(counts[row["tag"]])
+        assert row["mean"] == pytest.approx(np.mean(counts[row["tag"]]))
+    with pytest.raises(ValueError):
+        group_by(frame, ["tags"])
+
+
+def test_hashtag_report(corpus):
+    report = tag_report(corpus.read("cards", ["hashtags", "score"]), "hashtags", top=1)
+    assert report[0]["hashtag"] == "#IA" and report[0]["cards"] == 400
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from clickbait.__main__ import main
+from clickbait.bench import STAGES, compare, run_benchmarks
+from clickbait.dedup import find_duplicates
+from clickbait.synthetic import synthetic_cards
+
+
+def report(**rates):
+    return {"results": {"1k": {name: {"items_per_s": rate} for name, rate in rates.items()}}}
+
+
+def test_synthetic_cards_are_reproducible():
+    first = list(synthetic_cards(200, seed=3))
+    assert first == list(synthetic_cards(200, seed=3))
+    assert first != list(synthetic_cards(200, seed=4))
+    assert len({card.path for card in first}) == 200
+    assert all(len(card.titles) == 5 and card.path.startswith("synthetic/") for card in first)
+
+
+def test_synthetic_rewrites_are_found_by_dedup():
+    cards = list(synthetic_cards(1000))
+    rewrites = {card.path for card in cards if card.headline.endswith("(parte 2)")}
+    assert 20 < len(rewrites) < 80
+    clustered = {key for cluster in find_duplicates(cards) for key in cluster[1:]}
+    assert len(rewrites & clustered) >= 0.9 * len(rewrites)
+
+
+def test_run_benchmarks_reports_every_stage(tmp_path):
+    result = run_benchmarks(sizes=["10"], repeat=1, workdir=str(tmp_path))
+    assert set(result["results"]["10"]) == set(STAGES)
+    for timing in result["results"]["10"].values():
+        assert timing["items"] >= 10 and timing["seconds"] >= 0
+    assert result["results"]["10"]["score"]["items"] == 50
+    json.dumps(result, allow_nan=False)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_prerequisites_run_but_are_not_reported(tmp_path):
+    result = run_benchmarks(sizes=["10"], stages=["index"], repeat=1, workdir=str(tmp_path))
+    assert list(result["results"]["10"]) == ["index"]
+
+
+def test_unknown_stage():
+    with pytest.raises(ValueError):
+        run_benchmarks(stages=["compile"])
+
+
+def test_compare_flags_regressions_past_the_tolerance():
+    baseline = report(parse=1000.0, render=1000.0)
+    assert compare(baseline, report(parse=950.0, render=1200.0)) == []
+    assert compare(baseline, report(parse=500.0)) == ["1k/parse: 500/s vs 1,000/s (-50.0%)"]
+    assert compare(baseline, report(parse=850.0), tolerance=0.2) == []
+
+
+@pytest.mark.parametrize("before, after", [(None, 10.0), (10.0, None), (0.0, 10.0), (float("inf"), 10.0)])
+def test_compare_skips_unusable_rates(before, after):
+    assert compare(report(parse=before), report(parse=after)) == []
+
+
+def test_compare_skips_stages_missing_from_the_baseline():
+    assert compare(report(parse=1000.0), report(parse=1.0, dedup=1.0)) == ["1k/parse: 1/s vs 1,000/s (-99.9%)"]
+    assert compare({}, report(parse=1.0)) == []
+
+
+def test_cli_writes_valid_json_and_compares(tmp_path, capsys):
+    out = tmp_path / "bench.json"
+    assert main(["bench", "--sizes", "10", "--stages", "render,parse", "--repeat", "1", "--out", str(out)]) == 0
+    saved = json.loads(out.read_text(), parse_constant=lambda name: pytest.fail(f"{name} in JSON"))
+    assert set(saved["results"]["10"]) == {"render", "parse"}
+
+    for timing in saved["results"]["10"].values():
+        timing["items_per_s"] = 1e12
+    out.write_text(json.dumps(saved))
+    assert main(["bench", "--sizes", "10", "--stages", "render", "--repeat", "1", "--compare", str(out)]) == 1
+    assert "REGRESSION 10/render" in capsys.readouterr().err
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import pytest
+
+from clickbait.cache import CacheStats, CachingBackend, ResponseCache, cache_key
+from clickbait.pipeline import Completion, FakeBackend, Topic, generate
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_cache_key_depends_on_model_prompt_and_params():
+    key = cache_key("m", "prompt", {"temperature": 0.5, "top_p": 1})
+    assert key == cache_key("m", "prompt", {"top_p": 1, "temperature": 0.5})
+    assert key != cache_key("m2", "prompt", {"temperature": 0.5, "top_p": 1})
+    assert key != cache_key("m", "prompt ", {"temperature": 0.5, "top_p": 1})
+    assert key != cache_key("m", "prompt", {"temperature": 0.7, "top_p": 1})
+    assert cache_key("m", "p") == cache_key("m", "p", {})
+
+
+def test_hits_and_misses_are_counted():
+    with ResponseCache() as cache:
+        assert cache.get("k", "titles") is None
+        cache.put("k", Completion("ção", 10, 5), stage="titles", elapsed=0.25)
+        hit = cache.get("k", "titles")
+        assert (hit.text, hit.prompt_tokens, hit.completion_tokens) == ("ção", 10, 5)
+        assert len(cache) == 1 and cache.size_bytes == len("ção".encode())
+        stats = cache.stats.as_dict()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+        assert (stats["tokens_saved"], stats["seconds_saved"]) == (15, 0.25)
+        assert stats["by_stage"] == {"titles": {"hits": 1, "misses": 1}}
+
+
+def test_least_recently_read_entries_are_evicted_first(clock):
+    with ResponseCache(max_entries=2, clock=clock) as cache:
+        cache.put("a", Completion("a"))
+        clock.now += 1
+        cache.put("b", Completion("b"))
+        clock.now += 1
+        assert cache.get("a") is not None
+        clock.now += 1
+        cache.put("c", Completion("c"))
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.stats.evictions == 1
+
+
+def test_byte_bound(clock):
+    with ResponseCache(max_bytes=10, clock=clock) as cache:
+        for key in "abc":
+            clock.now += 1
+            cache.put(key, Completion(key * 4))
+        assert cache.size_bytes == 8 and len(cache) == 2
+        assert cache.get("a") is None
+        cache.put("b", Completion("b"))
+        assert cache.size_bytes == 5
+
+
+def test_entries_expire_after_ttl(clock):
+    with ResponseCache(ttl=60, clock=clock) as cache:
+        cache.put("old", Completion("x"))
+        clock.now += 30
+        cache.put("new", Completion("y"))
+        clock.now += 31
+        assert cache.get("old") is None
+        assert cache.get("new") is not None
+        assert cache.stats.expired == 1 and len(cache) == 1
+        clock.now += 60
+        assert cache.purge_expired() == 1
+        assert len(cache) == 0 and cache.size_bytes == 0
+
+
+def test_reading_does_not_extend_the_ttl(clock):
+    with ResponseCache(ttl=10, clock=clock) as cache:
+        cache.put("k", Completion("x"))
+        clock.now += 8
+        assert cache.get("k") is not None
+        clock.now += 8
+        assert cache.get("k") is None
+
+
+def test_cache_persists_on_disk(tmp_path):
+    path = tmp_path / "cache.db"
+    with ResponseCache(path) as cache:
+        cache.put("k", Completion("texto", 3, 4))
+    with ResponseCache(path) as cache:
+        assert len(cache) == 1 and cache.size_bytes == 5
+        assert cache.get("k").text == "texto"
+        cache.clear()
+        assert len(cache) == 0 and cache.get("k") is None
+
+
+def test_stats_repr_and_empty_hit_rate():
+    stats = CacheStats()
+    assert stats.hit_rate == 0.0
+    assert "hits=0" in repr(stats)
+
+
+def test_caching_backend_skips_calls_already_made():
+    topics = [Topic(f"Tema {i}") for i in range(4)]
+    inner = FakeBackend()
+    with ResponseCache() as cache:
+        backend = CachingBackend(inner, cache)
+        first, _ = generate(topics, backend, date="2026-02-06")
+        calls = inner.calls
+        second, _ = generate(topics, backend, date="2026-02-06")
+        assert inner.calls == calls
+        assert sorted(first, key=lambda c: c.headline) == sorted(second, key=lambda c: c.headline)
+        assert cache.stats.hits == calls and cache.stats.misses == calls
+        assert backend.model == inner.model
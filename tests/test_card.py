@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from clickbait.card import (
+    PILLARS,
+    CardParseError,
+    Title,
+    format_card,
+    iter_cards,
+    parse_file,
+    parse_text,
+)
+
+from .conftest import CARDS_DIR, card_paths, make_card
+
+
+@pytest.mark.parametrize("path", card_paths(), ids=os.path.basename)
+def test_real_cards_round_trip_byte_identical(path):
+    with open(path, encoding="utf-8", newline="") as fh:
+        text = fh.read()
+    assert format_card(parse_file(path)) == text
+
+
+def test_real_cards_parse_every_section(real_cards):
+    assert real_cards
+    for card in real_cards:
+        assert card.headline and not card.headline.startswith("🎬")
+        assert 0 <= card.score <= 10
+        assert card.strategy in ("Browse", "Search")
+        assert [t.number for t in card.titles] == [1, 2, 3, 4, 5]
+        assert tuple(t.pillar for t in card.titles) == PILLARS
+        assert card.tags and all(tag.strip() == tag for tag in card.tags)
+        assert card.hashtags and all(tag.startswith("#") for tag in card.hashtags)
+        assert card.hook and not card.hook.startswith('"')
+
+
+def test_in_memory_card_round_trips():
+    card = make_card()
+    assert parse_text(format_card(card)) == card
+
+
+def test_parse_accepts_comma_decimal_and_unaccented_strategy_label():
+    card = parse_text("# 🎬 Título\n\n**Score**: 8,5/10 | **Data**: 2026-01-02 | **Estrategia**: Search\n")
+    assert (card.headline, card.score, card.date, card.strategy) == ("Título", 8.5, "2026-01-02", "Search")
+    assert card.titles == () and card.hook == ""
+
+
+def test_title_rows_keep_pipes_inside_the_title():
+    text = format_card(make_card(titles=(Title(1, "FOMO", "A | B", 5),)))
+    assert parse_text(text).titles == (Title(1, "FOMO", "A | B", 5),)
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ("**Score**: 8/10 | **Data**: 2026-01-02 | **Estratégia**: Browse\n", "headline"),
+        ("# Título\n", "Score"),
+        ("# Título\n**Score**: oito/10\n", "malformed"),
+    ],
+)
+def test_parse_errors_name_the_problem(text, message):
+    with pytest.raises(CardParseError, match=message):
+        parse_text(text, path="x.md")
+
+
+def test_parse_error_is_a_value_error():
+    assert issubclass(CardParseError, ValueError)
+
+
+def test_slug_and_path(tmp_path):
+    path = tmp_path / "meu-card.md"
+    path.write_text(format_card(make_card()), encoding="utf-8")
+    card = parse_file(path)
+    assert card.path == str(path)
+    assert card.slug == "meu-card"
+    assert make_card().slug is None
+
+
+def test_iter_cards_walks_subdirectories(tmp_path):
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "top.md").write_text(format_card(make_card("Top")), encoding="utf-8")
+    (tmp_path / "a" / "b" / "deep.md").write_text(format_card(make_card("Deep")), encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("not a card", encoding="utf-8")
+    assert sorted(card.headline for card in iter_cards(tmp_path)) == ["Deep", "Top"]
+
+
+def test_iter_cards_reads_the_real_directory():
+    assert len(list(iter_cards(CARDS_DIR))) == len(card_paths())
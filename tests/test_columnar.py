@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import importlib.util
+import itertools
+import json
+
+import numpy as np
+import pytest
+
+from clickbait.columnar import COLUMNS, ColumnarWriter, Corpus, export_cards
+from clickbait.synthetic import synthetic_cards
+from clickbait.titlelen import measure
+
+from .conftest import make_card
+
+FORMATS = [
+    "numpy",
+    pytest.param(
+        "parquet",
+        marks=pytest.mark.skipif(importlib.util.find_spec("pyarrow") is None, reason="needs pyarrow"),
+    ),
+]
+
+
+@pytest.fixture(params=FORMATS)
+def export(request, tmp_path, real_cards):
+    cards = [*real_cards, *synthetic_cards(250), make_card("Sem caminho", date="not a date")]
+    # A small chunk size spreads the rows and dictionaries over several chunks.
+    writer = export_cards(cards, tmp_path / "corpus", format=request.param, chunk_size=64)
+    return cards, writer, Corpus(tmp_path / "corpus")
+
+
+def test_manifest_counts(export):
+    cards, writer, corpus = export
+    assert corpus.storage == writer.format
+    assert corpus.rows == {"cards": len(cards), "titles": sum(len(c.titles) for c in cards)}
+
+
+def test_cards_table_round_trips(export):
+    cards, _, corpus = export
+    frame = corpus.read("cards")
+    assert len(frame) == len(cards)
+    assert frame["card"].tolist() == list(range(len(cards)))
+    assert frame["headline"].tolist() == [c.headline for c in cards]
+    assert frame["slug"].tolist() == [c.slug or "sem-caminho" for c in cards]
+    assert frame["score"].tolist() == [c.score for c in cards]
+    assert frame.labels("strategy").tolist() == [c.strategy for c in cards]
+    dates = frame["date"]
+    assert [str(d) for d in dates[:-1]] == [c.date for c in cards[:-1]]
+    assert np.isnat(dates[-1])
+    tags = np.asarray(frame.categories["tags"], dtype=object)[frame["tags"]]
+    offsets = frame.offsets["tags"]
+    assert [tuple(tags[a:b]) for a, b in itertools.pairwise(offsets)] == [c.tags for c in cards]
+
+
+def test_titles_table_round_trips(export):
+    cards, _, corpus = export
+    frame = corpus.read("titles", ["card", "pillar", "text", "chars", "width", "score"])
+    titles = [(i, card, t) for i, card in enumerate(cards) for t in card.titles]
+    assert frame["card"].tolist() == [i for i, _, _ in titles]
+    assert frame["text"].tolist() == [t.text for _, _, t in titles]
+    assert frame.labels("pillar").tolist() == [t.pillar for _, _, t in titles]
+    assert frame["chars"].tolist() == [t.chars for _, _, t in titles]
+    assert frame["width"].tolist() == [measure(t.text).width for _, _, t in titles]
+    assert frame["score"].tolist() == [c.score for _, c, _ in titles]
+    assert "date" not in frame
+
+
+def test_filter_keeps_list_offsets_aligned(export):
+    cards, _, corpus = export
+    frame = corpus.read("cards", ["strategy", "tags"])
+    browse = frame.filter(frame["strategy"] == frame.code("strategy", "Browse"))
+    expected = [c.tags for c in cards if c.strategy == "Browse"]
+    tags = np.asarray(browse.categories["tags"], dtype=object)[browse["tags"]]
+    assert [tuple(tags[a:b]) for a, b in itertools.pairwise(browse.offsets["tags"])] == expected
+    assert frame.code("strategy", "Shorts") == -1
+
+
+def test_empty_export(tmp_path):
+    export_cards([], tmp_path / "empty", format="numpy")
+    frame = Corpus(tmp_path / "empty").read("titles")
+    assert len(frame) == 0 and set(frame.columns) == set(COLUMNS["titles"])
+
+
+def test_incomplete_or_foreign_exports_are_rejected(tmp_path):
+    writer = ColumnarWriter(tmp_path / "partial", format="numpy", chunk_size=1)
+    writer.write(synthetic_cards(3))
+    with pytest.raises(FileNotFoundError):
+        Corpus(tmp_path / "partial")
+    writer.close()
+    assert Corpus(tmp_path / "partial").rows["cards"] == 3
+
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "manifest.json").write_text(json.dumps({"format": "x", "version": 1}))
+    with pytest.raises(ValueError):
+        Corpus(tmp_path / "other")
+
+
+def test_bad_arguments(tmp_path):
+    with pytest.raises(ValueError):
+        ColumnarWriter(tmp_path, format="csv")
+    export_cards([make_card()], tmp_path / "c", format="numpy")
+    corpus = Corpus(tmp_path / "c")
+    with pytest.raises(ValueError):
+        corpus.read("authors")
+    with pytest.raises(ValueError):
+        corpus.read("cards", ["pillar"])
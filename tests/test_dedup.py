@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import itertools
+
+import numpy as np
+import pytest
+
+from clickbait.card import Card, Title, format_card, iter_cards
+from clickbait.dedup import (
+    Deduplicator,
+    LSHIndex,
+    MinHasher,
+    card_features,
+    common_words,
+    find_duplicates,
+    similarity,
+)
+
+from .conftest import make_card
+
+
+def words(start: int, stop: int) -> str:
+    return " ".join(f"w{i}" for i in range(start, stop))
+
+
+def word_card(start: int, stop: int, **fields: object) -> Card:
+    text = words(start, stop)
+    fields.setdefault("titles", (Title(1, "FOMO", text, len(text)),))
+    fields.setdefault("tags", tuple(text.split()))
+    fields.setdefault("hook", text)
+    return make_card(f"card {start}", **fields)
+
+
+def part_two(card: Card) -> Card:
+    titles = (Title(1, card.titles[0].pillar, card.titles[0].text + " (parte 2)", 0), *card.titles[1:])
+    return Card(
+        card.headline + " (parte 2)",
+        card.score,
+        card.date,
+        card.strategy,
+        titles,
+        card.tags,
+        card.hashtags,
+        card.hook,
+    )
+
+
+def test_features_drop_stopwords_and_common_words():
+    card = make_card(titles=(Title(1, "FOMO", "🔥 Todo dev já está usando ISSO", 0),), tags=("dev", "openclaw"))
+    titles, tags, hook = card_features(card, frozenset({"openclaw"}))
+    assert titles == {"todo", "dev", "ja", "esta", "usando"}
+    assert tags == {"dev"}
+    assert "voce" not in hook and "o" not in hook
+
+
+def test_common_words_needs_enough_cards():
+    cards = [word_card(i, i + 3, tags=("openclaw",), hashtags=()) for i in range(0, 60, 3)]
+    assert common_words(cards) == frozenset({"openclaw"})
+    assert common_words(cards[:9]) == frozenset()
+
+
+def test_similarity_estimates_jaccard():
+    hasher = MinHasher(num_perm=600)
+    a = hasher.card_signature(word_card(0, 100))
+    b = hasher.card_signature(word_card(50, 150))
+    assert similarity(a, a) == 1.0
+    assert similarity(a, b) == pytest.approx(50 / 150, abs=0.06)
+    assert similarity(a, hasher.card_signature(word_card(200, 300))) < 0.05
+
+
+def test_empty_fields_do_not_count_as_matches():
+    hasher = MinHasher()
+    a = hasher.card_signature(word_card(0, 10, tags=(), hook=""))
+    b = hasher.card_signature(word_card(100, 110, tags=(), hook=""))
+    assert similarity(a, b) < 0.1
+    empty = make_card(titles=(), tags=(), hook="")
+    assert similarity(hasher.card_signature(empty), hasher.card_signature(empty)) == 0.0
+
+
+def test_cards_with_empty_fields_do_not_share_buckets():
+    index = LSHIndex()
+    hasher = MinHasher()
+    for i in range(20):
+        index.add(i, hasher.card_signature(word_card(i * 10, i * 10 + 10, tags=(), hook="")))
+    assert index.candidates(hasher.card_signature(word_card(500, 510, tags=(), hook=""))) == set()
+
+
+def test_real_cards_are_far_from_the_threshold(real_cards):
+    # Including the three install/setup cards: same topic, different wording.
+    assert find_duplicates(real_cards) == []
+    hasher = MinHasher(common=common_words(real_cards))
+    signatures = [hasher.card_signature(card) for card in real_cards]
+    assert max(similarity(a, b) for a, b in itertools.combinations(signatures, 2)) < 0.25
+    rewrites = [similarity(hasher.card_signature(card), hasher.card_signature(part_two(card))) for card in real_cards]
+    assert min(rewrites) > 0.9
+
+
+def test_a_sequel_is_a_duplicate_of_its_card(real_cards):
+    original = real_cards[0]
+    clusters = find_duplicates([*real_cards, part_two(original)])
+    assert clusters == [[original.path, original.headline + " (parte 2)"]]
+
+
+def test_duplicate_slugs_in_subdirectories(tmp_path):
+    card = make_card()
+    for folder in ("janeiro", "fevereiro"):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "openclaw.md").write_text(format_card(card), encoding="utf-8")
+    clusters = find_duplicates(sorted(iter_cards(tmp_path), key=lambda c: c.path))
+    assert clusters == [[str(tmp_path / "fevereiro" / "openclaw.md"), str(tmp_path / "janeiro" / "openclaw.md")]]
+
+
+def test_clusters_do_not_chain():
+    # b is close to a and c is close to b, but c is far from a.
+    a, b, c = word_card(0, 100), word_card(20, 120), word_card(40, 140)
+    assert find_duplicates([a, b, c], threshold=0.6, num_perm=600) == [["card 0", "card 20"]]
+
+
+def test_cards_without_paths_get_unique_keys():
+    card = make_card()
+    assert find_duplicates([card, card, card]) == [[card.headline, f"{card.headline}#2", f"{card.headline}#3"]]
+
+
+def test_deduplicator_admits_each_card_once():
+    dedup = Deduplicator()
+    assert len(dedup) == 0 and not dedup
+    card = make_card()
+    assert dedup.admit(card)
+    assert not dedup.admit(part_two(card))
+    assert dedup.admit(word_card(0, 20))
+    assert len(dedup) == 2
+    assert [key for key, _ in dedup.duplicates(card)] == [card.headline]
+
+
+def test_deduplicator_add_keeps_keys_apart():
+    dedup = Deduplicator()
+    dedup.add(make_card())
+    dedup.add(make_card())
+    assert len(dedup) == 2
+
+
+def test_lsh_index():
+    hasher = MinHasher()
+    index = LSHIndex()
+    signature = hasher.card_signature(make_card())
+    index.add("a", signature)
+    assert "a" in index and index.signature("a") is signature
+    with pytest.raises(KeyError):
+        index.add("a", signature)
+    with pytest.raises(ValueError):
+        index.query(signature[:10])
+    assert index.query(signature) == [("a", 1.0)]
+    index.remove("a")
+    assert len(index) == 0 and index.query(signature) == []
+    assert all(not bucket for bucket in index._buckets)
+
+
+@pytest.mark.parametrize("threshold", [0.0, 1.5])
+def test_lsh_index_rejects_bad_thresholds(threshold):
+    with pytest.raises(ValueError):
+        LSHIndex(threshold)
+
+
+def test_signature_is_deterministic():
+    card = make_card()
+    assert np.array_equal(MinHasher(seed=3).card_signature(card), MinHasher(seed=3).card_signature(card))
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import os
+import shutil
+
+import pytest
+
+from clickbait.card import format_card, parse_file
+from clickbait.index import CardIndex
+
+from .conftest import CARDS_DIR, card_paths, make_card
+
+
+@pytest.fixture
+def cards_dir(tmp_path):
+    directory = tmp_path / "cards"
+    shutil.copytree(CARDS_DIR, directory)
+    return directory
+
+
+@pytest.fixture
+def index():
+    with CardIndex() as index:
+        yield index
+
+
+def test_scan_indexes_every_card(index, cards_dir):
+    report = index.scan(cards_dir)
+    assert (report.seen, report.parsed, report.unchanged, report.removed) == (10, 10, 0, 0)
+    assert len(index) == len(card_paths())
+    for card in index:
+        assert card == parse_file(card.path)
+
+
+def test_rescan_only_reparses_changed_files(index, cards_dir):
+    index.scan(cards_dir)
+    assert index.scan(cards_dir).parsed == 0
+
+    changed = cards_dir / "openclaw-agente-24h.md"
+    card = parse_file(changed)
+    card.score = 1.5
+    changed.write_text(format_card(card), encoding="utf-8")
+    touched = cards_dir / "openclaw-vps-seguranca.md"
+    os.utime(touched, ns=(0, 0))
+    (cards_dir / "openclaw-tudo-isso-mesmo.md").unlink()
+
+    report = index.scan(cards_dir)
+    assert (report.parsed, report.unchanged, report.removed) == (1, 8, 1)
+    assert index.get(changed).score == 1.5
+    assert len(index) == 9
+
+
+def test_broken_file_is_reported_and_dropped(index, cards_dir):
+    index.scan(cards_dir)
+    broken = cards_dir / "openclaw-agente-24h.md"
+    broken.write_text("no headline here\n", encoding="utf-8")
+    report = index.scan(cards_dir)
+    assert [path for path, _ in report.errors] == [str(broken)]
+    assert index.get(broken) is None
+
+
+def test_scan_keeps_other_directories(index, tmp_path):
+    for name in ("one", "two"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "card.md").write_text(format_card(make_card(name)), encoding="utf-8")
+    index.scan(tmp_path / "one")
+    index.scan(tmp_path / "two")
+    assert sorted(card.headline for card in index) == ["one", "two"]
+
+
+def test_index_persists_between_connections(tmp_path, cards_dir):
+    db = tmp_path / "index.db"
+    with CardIndex(db) as index:
+        index.scan(cards_dir)
+    with CardIndex(db) as index:
+        assert len(index) == 10
+        assert index.scan(cards_dir).parsed == 0
+
+
+def test_query_filters_and_orders_by_score(index, cards_dir):
+    index.scan(cards_dir)
+    cards = index.query()
+    assert [card.score for card in cards] == sorted((card.score for card in cards), reverse=True)
+    assert all(card.score >= 8.7 for card in index.query(min_score=8.7))
+    assert all(card.score <= 8.5 for card in index.query(max_score=8.5))
+    assert len(index.query(limit=3)) == 3
+    strategies = {card.strategy for card in cards}
+    for strategy in strategies:
+        assert {card.strategy for card in index.query(strategy=strategy)} == {strategy}
+
+
+def test_query_mention_ignores_case_and_accents(index):
+    index.add(make_card("Segurança da VPS", path="a.md"))
+    index.add(make_card("Outro assunto", path="b.md", tags=("docker",)))
+    assert [card.headline for card in index.query(mention="SEGURANCA vps")] == ["Segurança da VPS"]
+    assert [card.headline for card in index.query(mention="dock")] == ["Outro assunto"]
+    assert index.query(mention="seguranca docker") == []
+
+
+def test_query_mention_without_fts(index):
+    index.has_fts = False
+    index.add(make_card("Segurança 100%", path="a.md"))
+    assert len(index.query(mention="seguranca")) == 1
+    assert index.query(mention="inexistente") == []
+
+
+def test_add_keys_relative_paths_by_absolute_path(index, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    index.add(make_card("Primeiro", path="card.md"))
+    index.add(make_card("Segundo", path=str(tmp_path / "card.md")))
+    assert len(index) == 1
+    assert index.get("card.md").headline == "Segundo"
+    assert index.get(tmp_path / "card.md").path == str(tmp_path / "card.md")
+
+
+def test_add_requires_a_path(index):
+    with pytest.raises(ValueError):
+        index.add(make_card())
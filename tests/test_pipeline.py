@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+
+import pytest
+
+from clickbait.__main__ import main
+from clickbait.card import PILLARS, format_card, parse_text
+from clickbait.dedup import Deduplicator
+from clickbait.pipeline import (
+    STAGES,
+    BackendError,
+    Completion,
+    FakeBackend,
+    GenerationError,
+    Pipeline,
+    Topic,
+    generate,
+)
+
+
+class FlakyBackend(FakeBackend):
+    """Fails the first ``failures[stage]`` calls of each stage."""
+
+    def __init__(self, failures: dict[str, int], error: type[BaseException] = BackendError) -> None:
+        super().__init__()
+        self.failures = collections.Counter(failures)
+        self.error = error
+
+    async def complete(self, prompt: str, *, stage: str, **params: object) -> Completion:
+        if self.failures[stage] > 0:
+            self.failures[stage] -= 1
+            self.calls += 1
+            raise self.error(f"{stage} is down")
+        return await super().complete(prompt, stage=stage, **params)
+
+
+class SlowBackend(FakeBackend):
+    async def complete(self, prompt: str, *, stage: str, **params: object) -> Completion:
+        await asyncio.sleep(1)
+        return await super().complete(prompt, stage=stage, **params)
+
+
+class TrackingBackend(FakeBackend):
+    """Records the most concurrent calls per stage and topics in flight."""
+
+    def __init__(self, latency: float = 0.002) -> None:
+        super().__init__(latency=latency)
+        self.active: collections.Counter[str] = collections.Counter()
+        self.peak: collections.Counter[str] = collections.Counter()
+        self.started: set[str] = set()
+        self.finished: set[str] = set()
+        self.peak_topics = 0
+
+    async def complete(self, prompt: str, *, stage: str, **params: object) -> Completion:
+        headline = prompt.split('"')[1]
+        self.started.add(headline)
+        self.peak_topics = max(self.peak_topics, len(self.started - self.finished))
+        self.active[stage] += 1
+        self.peak[stage] = max(self.peak[stage], self.active[stage])
+        try:
+            return await super().complete(prompt, stage=stage, **params)
+        finally:
+            self.active[stage] -= 1
+            if stage == "score":
+                self.finished.add(headline)
+
+
+def topics(n: int, strategy: str = "Browse") -> list[Topic]:
+    return [Topic(f"Tema {i}: OpenClaw", strategy) for i in range(n)]
+
+
+def test_generates_a_complete_card():
+    cards, errors = generate([Topic("OpenClaw: o devorador de tokens", "Search")], FakeBackend(), date="2026-02-06")
+    assert errors == []
+    (card,) = cards
+    assert card.headline == "OpenClaw: o devorador de tokens"
+    assert (card.strategy, card.date) == ("Search", "2026-02-06")
+    assert tuple(t.pillar for t in card.titles) == PILLARS
+    assert len(card.tags) == 12
+    assert all(tag.startswith("#") for tag in card.hashtags)
+    assert card.hook and not card.hook.startswith('"')
+    assert 0 <= card.score <= 10
+    assert parse_text(format_card(card)) == card
+
+
+def test_every_stage_is_called_once_per_topic():
+    backend = FakeBackend()
+    cards, _ = generate(topics(7), backend)
+    assert len(cards) == 7
+    assert backend.calls == 7 * len(STAGES)
+
+
+def test_retries_until_the_call_succeeds():
+    backend = FlakyBackend({"tags": 2})
+    cards, errors = generate(topics(1), backend, retries=2, backoff=0)
+    assert len(cards) == 1 and errors == []
+    assert backend.calls == len(STAGES) + 2
+
+
+def test_exhausted_retries_raise_generation_error():
+    backend = FlakyBackend({"hook": 3})
+    cards, errors = generate(topics(1), backend, retries=2, backoff=0)
+    assert cards == []
+    (error,) = errors
+    assert isinstance(error, GenerationError)
+    assert error.stage == "hook"
+    assert error.topic.headline == "Tema 0: OpenClaw"
+    assert isinstance(error.cause, BackendError)
+    assert "hook" in str(error)
+
+
+def test_backoff_grows_exponentially(monkeypatch):
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr("clickbait.pipeline.random.uniform", lambda low, high: 0.0)
+    monkeypatch.setattr("clickbait.pipeline.asyncio.sleep", sleep)
+    generate(topics(1), FlakyBackend({"score": 3}), retries=3, backoff=0.5)
+    assert delays == [0.5, 1.0, 2.0]
+
+
+def test_timeouts_are_retried_then_reported():
+    cards, errors = generate(topics(1), SlowBackend(), retries=1, backoff=0, timeout=0.01)
+    assert cards == []
+    assert isinstance(errors[0].cause, asyncio.TimeoutError)
+
+
+def test_unexpected_errors_propagate():
+    with pytest.raises(RuntimeError):
+        generate(topics(2), FlakyBackend({"titles": 1}, RuntimeError), backoff=0)
+
+
+def test_one_failed_topic_does_not_stop_the_others():
+    backend = FlakyBackend({"titles": 1})
+    cards, errors = generate(topics(5), backend, retries=0)
+    assert len(cards) == 4 and len(errors) == 1
+
+
+def test_stage_semaphores_cap_concurrent_calls():
+    backend = TrackingBackend()
+    pipeline = Pipeline(backend, limits={"titles": 2, "score": 1}, default_limit=3)
+    cards, _ = asyncio.run(pipeline.run(topics(12)))
+    assert len(cards) == 12
+    assert backend.peak["titles"] == 2
+    assert backend.peak["score"] == 1
+    assert backend.peak["tags"] == backend.peak["hook"] == 3
+
+
+def test_max_topics_bounds_topics_in_flight_and_refills():
+    backend = TrackingBackend()
+    cards, errors = asyncio.run(Pipeline(backend, max_topics=3).run(topics(20)))
+    assert len(cards) == 20 and errors == []
+    assert backend.peak_topics == 3
+
+
+def test_topics_are_consumed_lazily():
+    consumed = []
+
+    def source():
+        for topic in topics(10):
+            consumed.append(topic)
+            yield topic
+
+    async def first():
+        stream = Pipeline(FakeBackend(), max_topics=2).stream(source())
+        card = await stream.__anext__()
+        await stream.aclose()
+        return card
+
+    asyncio.run(first())
+    # The first two topics, plus the refill once they finish together.
+    assert len(consumed) == 4
+
+
+def test_admit_filters_cards():
+    cards, errors = generate(topics(6), FakeBackend(), admit=lambda card: card.headline[5] in "024")
+    assert sorted(card.headline for card in cards) == ["Tema 0: OpenClaw", "Tema 2: OpenClaw", "Tema 4: OpenClaw"]
+    assert errors == []
+
+
+def test_admit_with_an_empty_deduplicator():
+    dedup = Deduplicator()
+    cards, _ = generate(topics(2) + topics(2), FakeBackend(), admit=dedup.admit)
+    assert len(cards) == 2
+    assert len(dedup) == 2
+
+
+def test_rejects_unknown_stages_and_strategies():
+    with pytest.raises(ValueError):
+        Pipeline(FakeBackend(), limits={"thumbnail": 1})
+    with pytest.raises(ValueError):
+        Topic("x", "Shorts")
+
+
+def test_fake_backend_is_deterministic():
+    async def answer(backend):
+        return (await backend.complete('"OpenClaw"', stage="titles")).text
+
+    assert asyncio.run(answer(FakeBackend())) == asyncio.run(answer(FakeBackend(seed=5)))
+
+
+@pytest.mark.parametrize("dedup, written", [([], 2), (["--dedup", "0.5"], 1)])
+def test_cli_generate_dedup(tmp_path, capsys, dedup, written):
+    topics_file = tmp_path / "topics.txt"
+    topics_file.write_text("Browse | OpenClaw: o devorador\nBrowse | OpenClaw: o devorador\n", encoding="utf-8")
+    out = tmp_path / "cards"
+    assert main(["generate", str(topics_file), "--out", str(out), *dedup]) == 0
+    assert len(list(out.glob("*.md"))) == written
+    if dedup:
+        assert "skipped 1 near-duplicate" in capsys.readouterr().err
+
+
+def test_cli_generate_dedup_checks_cards_already_written(tmp_path, capsys):
+    topics_file = tmp_path / "topics.txt"
+    topics_file.write_text("Browse | OpenClaw: novo teste\n", encoding="utf-8")
+    out = tmp_path / "cards"
+    for _ in range(2):
+        assert main(["generate", str(topics_file), "--out", str(out), "--dedup", "0.9"]) == 0
+    assert [path.name for path in out.glob("*.md")] == ["openclaw-novo-teste.md"]
+    assert "skipped 1 near-duplicate" in capsys.readouterr().err
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+import types
+
+import pytest
+
+from clickbait import profiling
+from clickbait.profiling import Histogram, Profiler
+
+
+def test_hooks_do_nothing_while_disabled():
+    with profiling.stage("x", 5) as timer:
+        pass
+    assert timer.items == 5
+    profiling.active().count("x")
+    assert not isinstance(profiling.active(), Profiler)
+
+
+def test_enabled_routes_hooks_and_restores_the_previous_profiler():
+    outer, inner = Profiler(), Profiler()
+    with profiling.enabled(outer):
+        with profiling.enabled(inner):
+            with profiling.stage("parse", 3):
+                pass
+        assert profiling.active() is outer
+        with profiling.stage("parse") as timer:
+            timer.items = 7
+        profiling.active().count("files", 2)
+    assert not isinstance(profiling.active(), Profiler)
+    assert inner.report()["stages"]["parse"]["items"] == 3
+    report = outer.report()
+    assert report["stages"]["parse"]["items"] == 7
+    assert report["counters"] == {"files": 2}
+
+
+def test_report_is_strict_json_even_for_untimed_stages(monkeypatch):
+    monkeypatch.setattr(profiling, "time", types.SimpleNamespace(perf_counter=lambda: 0.0))
+    prof = Profiler()
+    with prof.stage("instant", 10):
+        pass
+    report = prof.report()
+    assert report["stages"]["instant"]["items_per_s"] is None
+    json.dumps(report, allow_nan=False)
+
+
+def test_stage_records_errors_too():
+    prof = Profiler()
+    with pytest.raises(KeyError):
+        with prof.stage("lookup"):
+            raise KeyError("x")
+    assert prof.report()["stages"]["lookup"]["count"] == 1
+
+
+def test_histogram_quantiles():
+    histogram = Histogram()
+    for micros in (1, 2, 3, 100, 1000):
+        histogram.add(micros / 1e6)
+    assert histogram.count == 5
+    assert histogram.quantile(0.5) == pytest.approx(4e-6)
+    assert histogram.quantile(1.0) == pytest.approx(1e-3)
+    data = histogram.as_dict()
+    assert sum(data["buckets_us"].values()) == 5
+    assert data["min_s"] == pytest.approx(1e-6)
+    assert Histogram().as_dict()["min_s"] == 0.0 and Histogram().quantile(0.5) == 0.0
+
+
+def test_memory_peaks():
+    prof = Profiler(memory=True)
+    with profiling.enabled(prof):
+        with profiling.stage("alloc"):
+            data = bytearray(4 << 20)
+            del data
+    assert prof.report()["stages"]["alloc"]["peak_bytes"] >= 4 << 20
+
+
+def test_cprofile_dumps_once_per_stage_and_skips_nested_ones(tmp_path):
+    prof = Profiler(cprofile_dir=tmp_path / "prof")
+    with prof.stage("1k/render"):
+        with prof.stage("inner"):
+            pass
+    assert [p.name for p in (tmp_path / "prof").iterdir()] == ["1k_render.prof"]
+    for _ in range(2):
+        with prof.stage("1k/render"):
+            with prof.stage("inner"):
+                pass
+    assert sorted(p.name for p in (tmp_path / "prof").iterdir()) == ["1k_render.prof", "inner.prof"]
+
+
+def test_write_json(tmp_path):
+    prof = Profiler()
+    with prof.stage("x"):
+        pass
+    prof.write_json(tmp_path / "profile.json")
+    assert "x" in json.loads((tmp_path / "profile.json").read_text())["stages"]
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from clickbait.card import format_card, parse_file
+from clickbait.render import CardTemplate, CardWriter, render_card, write_atomic
+
+from .conftest import card_paths, make_card
+
+
+def names(directory) -> list[str]:
+    return sorted(os.listdir(directory))
+
+
+def test_render_card_matches_the_real_cards(real_cards):
+    for card, path in zip(real_cards, card_paths()):
+        with open(path, encoding="utf-8", newline="") as fh:
+            assert render_card(card) == format_card(card) == fh.read()
+
+
+def test_custom_template():
+    template = CardTemplate("{headline} ({score})\n{titles}{tags}", row="{number}. {text}\n")
+    card = make_card(score=8)
+    assert template.render(card) == (
+        "OpenClaw: O Devorador (8.0)\n"
+        "1. 🔍 O que ninguém conta sobre o OpenClaw\n"
+        "2. 🔥 Todo dev já está usando isso\n"
+        "openclaw, agente ia"
+    )
+    assert template.render_many([card, card]) == [template.render(card)] * 2
+    assert CardTemplate("").render(card) == ""
+
+
+@pytest.mark.parametrize("template", ["{thumbnail}", "{score:.2f}", "{headline!r}"])
+def test_template_rejects_unknown_fields_and_specs(template):
+    with pytest.raises(ValueError):
+        CardTemplate(template)
+
+
+def test_write_atomic_replaces_the_file(tmp_path):
+    path = tmp_path / "card.md"
+    write_atomic(path, "old")
+    write_atomic(path, "ção\n", fsync=True)
+    assert path.read_bytes() == "ção\n".encode()
+    assert names(tmp_path) == ["card.md"]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_write_batch_names_cards_by_slug(tmp_path, workers):
+    cards = [make_card(f"Card {i}") for i in range(10)]
+    paths = CardWriter(tmp_path, workers=workers).write_batch(cards)
+    assert paths == [str(tmp_path / f"card-{i}.md") for i in range(10)]
+    for card, path in zip(cards, paths):
+        assert parse_file(path).headline == card.headline
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_write_batch_with_a_custom_template(tmp_path, workers):
+    template = CardTemplate("# {headline}\n{titles}", row="- {text}\n")
+    writer = CardWriter(tmp_path, workers=workers, template=template)
+    cards = [make_card(f"Card {i}") for i in range(3)]
+    for card, path in zip(cards, writer.write_batch(cards)):
+        with open(path, encoding="utf-8") as fh:
+            assert fh.read() == template.render(card)
+
+
+def test_cards_read_from_disk_keep_their_slug(tmp_path):
+    card = make_card(path="/elsewhere/meu-card.md")
+    assert CardWriter(tmp_path).write_batch([card]) == [str(tmp_path / "meu-card.md")]
+
+
+def test_on_conflict_suffix(tmp_path):
+    writer = CardWriter(tmp_path)
+    writer.write_batch([make_card("Igual")])
+    paths = CardWriter(tmp_path).write_batch([make_card("Igual"), make_card("Igual")])
+    assert [os.path.basename(p) for p in paths] == ["igual-2.md", "igual-3.md"]
+
+
+def test_on_conflict_replace_and_skip(tmp_path):
+    CardWriter(tmp_path).write_batch([make_card("Igual", 1.0)])
+    assert CardWriter(tmp_path, on_conflict="skip").write_batch([make_card("Igual", 2.0)]) == []
+    assert parse_file(tmp_path / "igual.md").score == 1.0
+    CardWriter(tmp_path, on_conflict="replace").write_batch([make_card("Igual", 3.0)])
+    assert parse_file(tmp_path / "igual.md").score == 3.0
+    assert names(tmp_path) == ["igual.md"]
+    with pytest.raises(ValueError):
+        CardWriter(tmp_path, on_conflict="overwrite")
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_a_failed_batch_writes_nothing(tmp_path, workers):
+    writer = CardWriter(tmp_path, workers=workers)
+    cards = [make_card(f"Card {i}") for i in range(6)]
+    cards[3].score = "not a number"
+    with pytest.raises(ValueError):
+        writer.write_batch(cards)
+    assert names(tmp_path) == []
+    cards[3].score = 8.0
+    assert len(writer.write_batch(cards)) == 6
+    assert names(tmp_path) == [f"card-{i}.md" for i in range(6)]
+
+
+def dead_pid() -> int:
+    child = subprocess.Popen([sys.executable, "-c", "pass"])
+    child.wait()
+    return child.pid
+
+
+def test_cleanup_removes_only_stale_temp_files(tmp_path):
+    live = tmp_path / f".clickbait-a.md.{os.getpid()}.0.tmp"
+    dead = tmp_path / f".clickbait-b.md.{dead_pid()}.0.tmp"
+    old = tmp_path / f".clickbait-c.md.{os.getpid()}.1.tmp"
+    other = tmp_path / "notes.tmp"
+    for path in (live, dead, old, other):
+        path.write_text("x")
+    two_hours_ago = time.time() - 7200
+    os.utime(old, (two_hours_ago, two_hours_ago))
+
+    assert CardWriter(tmp_path).cleanup() == 2
+    assert names(tmp_path) == sorted([live.name, other.name])
+    os.utime(live, (two_hours_ago, two_hours_ago))
+    assert CardWriter(tmp_path).cleanup(max_age=60) == 1
+    assert names(tmp_path) == [other.name]
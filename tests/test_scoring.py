@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from clickbait.card import PILLARS
+from clickbait.scoring import TitleScorer, extract_features, score_titles
+
+TITLES = [
+    "🔍 O SEGREDO que ninguém conta sobre o OpenClaw",
+    "⚠️ CUIDADO: este erro pode destruir sua VPS",
+    "🚀 Domine o OpenClaw em 30 minutos (grátis)",
+    "🤯 Isso muda tudo: a IA que tem memória",
+    "🔥 99% dos devs já estão usando - e você?",
+    "openclaw tutorial",
+]
+
+
+def test_scores_have_one_column_per_pillar():
+    batch = score_titles(TITLES)
+    assert len(batch) == len(TITLES)
+    assert batch.pillars.shape == (len(TITLES), len(PILLARS))
+    assert np.array_equal(batch.overall, batch.pillars.max(axis=1))
+    assert ((batch.pillars >= 0) & (batch.pillars <= 10)).all()
+
+
+def test_each_title_wins_its_own_pillar():
+    batch = score_titles(TITLES[:5])
+    assert batch.best_pillar().tolist() == [0, 1, 2, 3, 4]
+    assert [title for title, _ in batch.pick_per_pillar()] == TITLES[:5]
+
+
+def test_plain_title_scores_lowest():
+    batch = score_titles(TITLES)
+    assert batch.top(len(TITLES))[-1][0] == "openclaw tutorial"
+
+
+def test_top_orders_by_score_and_accepts_pillar_names():
+    batch = score_titles(TITLES)
+    scores = [score for _, score in batch.top(3)]
+    assert scores == sorted(scores, reverse=True) and len(scores) == 3
+    assert batch.top(1, "FOMO") == batch.top(1, 4)
+    assert batch.top(1, "FOMO")[0][0] == TITLES[4]
+    assert batch.top(0) == []
+
+
+def test_empty_batch():
+    batch = score_titles([])
+    assert len(batch) == 0
+    assert batch.top(5) == []
+    assert batch.pick_per_pillar() == []
+
+
+def test_features():
+    features = extract_features(["🔥 TODOS os DEVS usam API", "sem emoji", "★ outro símbolo"])
+    assert features.emoji.tolist() == [4, -2, -1]
+    assert features.caps.tolist() == [2, 0, 0]
+    assert features.cues[0, 4] >= 2
+    assert features.length[0] == len("🔥 TODOS os DEVS usam API") + 1
+
+
+@pytest.mark.parametrize("title", ["Isso", "Terror no museu", "renovar", "Eu compro", "Vendo queijo"])
+def test_cues_do_not_match_inside_words(title):
+    # Each contains "so ", "erro", "seu ", "nova", "pro " or "o que" inside a word.
+    cues = extract_features([title]).cues[0].tolist()
+    assert cues == ([0, 0, 0, 1, 0] if title == "Isso" else [0] * len(PILLARS))
+
+
+def test_cues_match_at_word_starts():
+    cues = extract_features(["só isso, o que é novo?", "ERRO no seu teste", "novamente"]).cues
+    assert cues.tolist() == [[2, 0, 0, 2, 1], [0, 1, 1, 0, 0], [0, 0, 0, 1, 0]]
+
+
+def test_length_score_peaks_in_the_sweet_spot():
+    scorer = TitleScorer()
+    scores = scorer.length_score(np.array([20, 38, 40, 43, 60, 101]))
+    assert scores[1] == scores[2] == scores[3] == 1.0
+    assert 0 < scores[0] < 1 and 0 < scores[4] < 1
+    assert scores[5] == 0.0
+
+
+@pytest.mark.parametrize("kwargs", [{"cue_weight": 1.5}, {"weights": (0, 0, 0)}])
+def test_scorer_rejects_bad_settings(kwargs):
+    with pytest.raises(ValueError):
+        TitleScorer(**kwargs)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from clickbait.card import format_card, iter_cards
+from clickbait.tags import TagIndex, normalize_tag
+
+from .conftest import make_card
+
+
+def tagged(name: str, score: float, *tags: str):
+    return make_card(name, score, tags=tags, hashtags=tuple("#" + t.replace(" ", "") for t in tags))
+
+
+@pytest.fixture
+def index():
+    return TagIndex.from_cards(
+        [
+            tagged("a", 9.0, "openclaw", "openclaw segurança", "vps"),
+            tagged("b", 8.0, "openclaw", "openclaw custo", "tokens"),
+            tagged("c", 7.0, "Openclaw Segurança", "docker"),
+        ]
+    )
+
+
+def test_normalize_tag():
+    assert normalize_tag("  Segurança  VPS ") == "seguranca vps"
+    assert normalize_tag("#OpenClaw") == "openclaw"
+    assert normalize_tag("🔥") == ""
+
+
+def test_tags_are_merged_by_folded_terms(index):
+    assert "OPENCLAW SEGURANCA" in index
+    assert index.cards("openclaw segurança") == {"a", "c"}
+    assert index.weight("openclaw seguranca") == 16.0
+    assert len(index) == 6
+
+
+def test_related_counts_co_occurrence(index):
+    assert dict(index.related("openclaw")) == {
+        "openclaw segurança": 1,
+        "vps": 1,
+        "openclaw custo": 1,
+        "tokens": 1,
+    }
+    assert index.related("unknown") == []
+
+
+def test_complete_returns_shortest_words_first(index):
+    index.add(tagged("d", 1.0, "segredo", "seg"))
+    assert index.complete("seg") == ["seg", "segredo", "seguranca"]
+    assert index.complete("SEGU") == ["seguranca"]
+    assert index.complete("xyz") == []
+
+
+def test_suggest_ranks_by_shared_words_then_weight(index):
+    assert index.suggest("openclaw segurança", n=3) == ["openclaw segurança", "openclaw", "openclaw custo"]
+
+
+def test_suggest_expands_a_partial_last_word(index):
+    assert index.suggest("openclaw seg", n=1) == ["openclaw segurança"]
+    assert index.suggest("doc", n=1) == ["docker"]
+
+
+def test_suggest_fills_in_with_related_tags(index):
+    suggestions = index.suggest("docker", n=3)
+    assert suggestions[0] == "docker"
+    assert "openclaw segurança" in suggestions
+
+
+def test_suggest_excludes_and_handles_empty_topics(index):
+    assert "openclaw" not in index.suggest("openclaw", exclude=["OpenClaw"])
+    assert index.suggest("🔥") == []
+    assert index.suggest("inexistente") == []
+
+
+def test_remove_forgets_a_card(index):
+    index.remove("b")
+    assert "openclaw custo" not in index
+    assert index.cards("openclaw") == {"a"}
+    assert index.weight("openclaw") == 9.0
+    assert index.complete("cust") == []
+    assert dict(index.related("openclaw")) == {"openclaw segurança": 1, "vps": 1}
+
+
+def test_re_adding_a_key_replaces_its_tags(index):
+    index.add(tagged("a", 1.0, "vps"), key="a")
+    assert index.cards("openclaw") == {"b"}
+    assert index.weight("vps") == 1.0
+
+
+def test_cards_with_the_same_slug_or_headline_are_kept_apart(tmp_path):
+    card = tagged("OpenClaw", 8.0, "openclaw custo")
+    for folder in ("jan", "fev"):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "openclaw.md").write_text(format_card(card), encoding="utf-8")
+    index = TagIndex.from_cards(iter_cards(tmp_path))
+    paths = {str(tmp_path / folder / "openclaw.md") for folder in ("jan", "fev")}
+    assert index.cards("openclaw custo") == paths
+    assert index.weight("openclaw custo") == 16.0
+
+    index = TagIndex.from_cards([card, card])
+    assert index.cards("openclaw custo") == {"OpenClaw", "OpenClaw#2"}
+    index.remove("OpenClaw")
+    assert index.cards("openclaw custo") == {"OpenClaw#2"}
+
+
+def test_hashtag_field():
+    index = TagIndex.from_cards([tagged("a", 9.0, "open claw")], field="hashtags")
+    assert "#openclaw" in index and "open claw" not in index
+    with pytest.raises(ValueError):
+        TagIndex("headline")
+
+
+def test_cached_rankings_match_a_fresh_index():
+    rng = random.Random(7)
+    vocabulary = [f"openclaw {word}" for word in ("vps", "custo", "seguro", "docker", "tokens", "api")]
+    cards = {
+        f"card{i}": tagged(f"card{i}", rng.uniform(5, 10), *rng.sample(vocabulary, 3)) for i in range(40)
+    }
+    live = TagIndex()
+    present = set()
+    for _ in range(200):
+        key = rng.choice(sorted(cards))
+        if key in present and rng.random() < 0.5:
+            live.remove(key)
+            present.discard(key)
+        else:
+            live.add(cards[key], key=key)
+            present.add(key)
+        live.suggest("openclaw", n=4)
+    fresh = TagIndex()
+    for key in sorted(present):
+        fresh.add(cards[key], key=key)
+    for topic in ("openclaw", "openclaw do", "vps custo"):
+        assert live.suggest(topic, n=4) == fresh.suggest(topic, n=4)
+
+
+def test_real_cards(real_cards):
+    index = TagIndex.from_cards(real_cards)
+    assert index.suggest("openclaw vps", n=5)[0].startswith("openclaw")
+    assert all(index.cards(tag) for tag in index.suggest("openclaw vps", n=5))
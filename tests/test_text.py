@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from clickbait.text import fold, slugify, terms
+
+
+def test_fold_strips_accents_and_case():
+    assert fold("Segurança") == fold("SEGURANCA") == "seguranca"
+    assert fold("Ação") == "acao"
+
+
+def test_terms_drop_emoji_and_punctuation():
+    assert terms("🔥 OpenClaw: é SEGURO? (24h)") == ["openclaw", "e", "seguro", "24h"]
+
+
+def test_slugify():
+    assert slugify("OpenClaw: O Devorador") == "openclaw-o-devorador"
+    assert slugify("🔥🔥") == "card"
+    long = slugify("palavra " * 20, max_length=20)
+    assert long == "palavra-palavra" and len(long) <= 20
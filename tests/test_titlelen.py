@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import pytest
+
+from clickbait.card import Title
+from clickbait.synthetic import synthetic_cards
+from clickbait.titlelen import TitleLength, graphemes, measure, measure_many, recount_chars, validate
+
+from .conftest import make_card
+
+
+@pytest.mark.parametrize(
+    "text, clusters",
+    [
+        ("abc", ["a", "b", "c"]),
+        ("⚠️ a", ["⚠️", " ", "a"]),
+        ("👍🏽!", ["👍🏽", "!"]),
+        ("👩‍💻x", ["👩‍💻", "x"]),
+        ("🇧🇷🇵🇹", ["🇧🇷", "🇵🇹"]),
+        ("1️⃣2", ["1️⃣", "2"]),
+        ("ação", ["a", "ç", "ã", "o"]),
+        ("nã̃o", ["n", "ã̃", "o"]),
+        ("a\r\nb", ["a", "\r\n", "b"]),
+        ("", []),
+    ],
+)
+def test_graphemes(text, clusters):
+    assert graphemes(text) == clusters
+    assert "".join(graphemes(text)) == text
+
+
+@pytest.mark.parametrize(
+    "text, chars, width",
+    [
+        ("OpenClaw", 8, 8),
+        ("⚠️ IA", 4, 5),
+        ("🔥 Devs", 6, 7),
+        ("👩‍💻", 1, 2),
+        ("🇧🇷", 1, 2),
+        ("ação", 4, 4),
+        ("漢字", 2, 4),
+        ("𠀀𠀁", 2, 4),
+        ("1️⃣ e 👍🏽", 5, 7),
+        ("a\u0301\U000e0020b", 2, 2),
+        ("\u0301a", 2, 1),
+        ("a\r\nb", 3, 2),
+        ("", 0, 0),
+    ],
+)
+def test_measure(text, chars, width):
+    assert measure(text) == TitleLength(chars, width, len(text))
+    assert len(graphemes(text)) == chars
+
+
+MIXED = [
+    "OpenClaw",
+    "⚠️ IA",
+    "🔥 Devs",
+    "👩‍💻 no 🇧🇷",
+    "nã̃o 漢字",
+    "",
+    "1️⃣2️⃣",
+    "\ufe0fa",
+    "a\r\nb ⚠️",
+    "👍🏽👍🏽!",
+]
+
+
+def test_measure_many_agrees_with_measure():
+    titles = MIXED + [t.text for card in synthetic_cards(50) for t in card.titles]
+    chars, width = measure_many(titles)
+    assert chars.tolist() == [measure(t).chars for t in titles]
+    assert width.tolist() == [measure(t).width for t in titles]
+    assert [len(graphemes(t)) for t in titles] == chars.tolist()
+    empty = measure_many([])
+    assert len(empty[0]) == len(empty[1]) == 0
+
+
+def test_validate_flags_long_and_truncated_titles():
+    report = validate(["curto", "x" * 50, "🔥" * 101])
+    assert report.too_long == [2]
+    assert report.truncated == [1, 2]
+    assert not report.ok
+    assert validate(["curto"]).ok
+
+
+def test_recount_chars():
+    card = make_card(titles=(Title(1, "FOMO", "🔥 Devs", 99),))
+    fixed = recount_chars(card)
+    assert fixed.titles == (Title(1, "FOMO", "🔥 Devs", 6),)
+    assert fixed.headline == card.headline and fixed.hook == card.hook